@@ -2,10 +2,10 @@
 
 
 import math
-import random
 import signal
 import sys
-import time
+
+import numpy as np
 
 from which_pyqt import PYQT_VER
 
@@ -21,61 +21,81 @@ else:
 
 # Import the code with the actual implementation
 from convex_hull import *
+from point_generator import generate_points
 
 # from convex_hull_complete_nonthread import *
 
 
+# Above this many points the point cloud is rasterized with numpy instead of
+# being drawn point by point
+POINT_RASTER_LIMIT = 20000
+
+
 # This class controls the visual stuff in the GUI.  An instance of it is passed to the solver
 # when it is called so that wrapper functions in the file "convex_hull.py" can update the GUI
 #
+# The points are drawn once into a cached QPixmap, which is only redrawn when the
+# points or the widget size change; repaints just blit it and draw the lines.
+#
 class PointLineView(QWidget):
     def __init__(self, status_bar):
         super(QWidget, self).__init__()
         self.setMinimumSize(600, 400)
 
-        self.pointList = {}
-        self.lineList = {}
+        # Each addPoints/addLines call is stored as one batch under a handle,
+        # which is what clearPoints/clearLines take to remove it again.  Points
+        # are kept as coordinate arrays, read out of the QPointFs once, so
+        # redrawing them after a resize only has to rescale.
+        self.pointBatches = {}  # handle -> (color, xs, ys)
+        self.lineBatches = {}  # handle -> (color, lines)
+        self.nextHandle = 0
         self.status_bar = status_bar
+        self.pointCache = None
 
     def displayStatusText(self, text):
         self.status_bar.showMessage(text)
-        self.update()
-        app.processEvents  # Why is this necessary????
 
-    def clearPoints(self):
-        self.pointList = {}
+    # Repaints are left to Qt, which folds any number of update() calls made
+    # before it gets back to the event loop into one
 
-    def clearLines(self, lines=None):
-        if (not lines):
-            self.lineList = {}
+    def clearPoints(self, handle=None):
+        if handle is None:
+            self.pointBatches = {}
         else:
-            for color in self.lineList:
-                for line in lines:
-                    try:
-                        self.lineList[color].remove(line)
-                    except:
-                        pass
+            self.pointBatches.pop(handle, None)
+        self.pointCache = None
         self.update()
-        app.processEvents()  # Why is this necessary????
 
-    def addPoints(self, point_list, color):
-        if color in self.pointList:
-            self.pointList[color].extend(point_list)
+    def clearLines(self, handle=None):
+        if handle is None:
+            self.lineBatches = {}
         else:
-            self.pointList[color] = point_list
+            self.lineBatches.pop(handle, None)
+        self.update()
+
+    def addPoints(self, point_list, color):
+        points = list(point_list)
+        xs = np.fromiter((point.x() for point in points), dtype=np.float64, count=len(points))
+        ys = np.fromiter((point.y() for point in points), dtype=np.float64, count=len(points))
+        self.pointBatches[self.nextHandle] = (color, xs, ys)
+        self.nextHandle += 1
+        self.pointCache = None
+        self.update()
+        return self.nextHandle - 1
 
     def addLines(self, line_list, color):
-        if color in self.lineList:
-            self.lineList[color].extend(line_list)
-        else:
-            self.lineList[color] = line_list
+        self.lineBatches[self.nextHandle] = (color, list(line_list))
+        self.nextHandle += 1
         self.update()
-        app.processEvents()  # Why is this necessary????
+        return self.nextHandle - 1
 
-    def paintEvent(self, event):
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.Antialiasing, True)
+    def resizeEvent(self, event):
+        self.pointCache = None
+        super(PointLineView, self).resizeEvent(event)
 
+    # Half the width and height of the drawing area, which is kept at a 3:2 ratio
+    # and centred; a point at (x, y) is drawn at (w * x, -h * y) from the centre
+    def drawingScale(self):
         w = self.width() / 2.0
         h = self.height() / 2.0
         w2h_desired_ratio = 1.5
@@ -83,25 +103,71 @@ class PointLineView(QWidget):
             h = w / w2h_desired_ratio
         else:
             w = h * w2h_desired_ratio
+        return w, h
 
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.Antialiasing, True)
+        w, h = self.drawingScale()
+
+        # The scale goes in the transform so the lines are handed to Qt as they
+        # are; a cosmetic pen keeps them one pixel wide regardless
         tform = QTransform()
         tform.translate(self.width() / 2.0, self.height() / 2.0)
-        tform.scale(1.0, -1.0)
+        tform.scale(w, -h)
         painter.setTransform(tform)
 
-        for color in self.lineList:
-            c = QColor(color[0], color[1], color[2])
-            painter.setPen(c)
-            for line in self.lineList[color]:
-                ln = QLineF(w * line.x1(), h * line.y1(), w * line.x2(), h * line.y2())
-                painter.drawLine(ln)
+        for color, lines in self.lineBatches.values():
+            pen = QPen(QColor(color[0], color[1], color[2]))
+            pen.setCosmetic(True)
+            painter.setPen(pen)
+            painter.drawLines(lines)
+
+        if self.pointCache is None:
+            self.pointCache = self.renderPoints(w, h)
+        painter.resetTransform()
+        painter.drawPixmap(0, 0, self.pointCache)
+
+    # Draws every point onto a transparent pixmap the size of the widget
+    def renderPoints(self, w, h):
+        pixmap = QPixmap(self.width(), self.height())
+        pixmap.fill(Qt.transparent)
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.Antialiasing, True)
 
-        for color in self.pointList:
-            c = QColor(color[0], color[1], color[2])
-            painter.setPen(c)
-            for point in self.pointList[color]:
-                pt = QPointF(w * point.x(), h * point.y())
-                painter.drawEllipse(pt, 1.0, 1.0)
+        for color, xs, ys in self.pointBatches.values():
+            xs = self.width() / 2.0 + w * xs
+            ys = self.height() / 2.0 - h * ys
+            if len(xs) > POINT_RASTER_LIMIT:
+                painter.drawImage(0, 0, self.rasterizePoints(xs, ys, color))
+            else:
+                # A round two pixel pen draws each point as the small dot it used to be
+                pen = QPen(QColor(color[0], color[1], color[2]), 2.0)
+                pen.setCapStyle(Qt.RoundCap)
+                painter.setPen(pen)
+                painter.drawPoints(QPolygonF([QPointF(x, y) for x, y in zip(xs.tolist(), ys.tolist())]))
+
+        painter.end()
+        return pixmap
+
+    # Bins the points into a per-pixel count and turns that into an image, with
+    # pixels more opaque the more points they hold
+    # Function Time Complexity: n + pixels
+    # Function Space Complexity: pixels
+    def rasterizePoints(self, xs, ys, color):
+        width, height = self.width(), self.height()
+        cols = xs.astype(np.intp)
+        rows = ys.astype(np.intp)
+        inside = (cols >= 0) & (cols < width) & (rows >= 0) & (rows < height)
+        counts = np.bincount(rows[inside] * width + cols[inside], minlength=width * height)
+
+        alpha = np.where(counts > 0, np.minimum(255, 127 + 32 * counts), 0).astype(np.uint32)
+        rgb = (color[0] << 16) | (color[1] << 8) | color[2]
+        pixels = (alpha << 24) | rgb
+        pixels = np.ascontiguousarray(pixels.astype(np.uint32).reshape(height, width))
+
+        # copy() so the image owns its memory once pixels goes away
+        return QImage(pixels.data, width, height, 4 * width, QImage.Format_ARGB32).copy()
 
 
 # Main GUI class
@@ -115,60 +181,30 @@ class Proj2GUI(QMainWindow):
 
         # Getting an instance of your solver
         self.solver = ConvexHullSolver()
+        self.solver.progress.connect(self.solveProgress)
+        self.solver.solved.connect(self.solveDone)
 
         # start the GUI
         self.initUI()
 
     # Generator for new sets of points that represent hull finding problem instances
     def newPoints(self):
+        seed = int(self.randSeed.text()) if self.randBySeed.isChecked() else None
 
-        if self.randBySeed.isChecked():
-            seed = int(self.randSeed.text())
-            random.seed(seed)
-        else:  # do by time
-            random.seed(time.time())
-
-        ptlist = []
-        unique_xvals = {}
-        max_r = 0.98
-        WIDTH = 1.0
-        HEIGHT = 1.0
         npoints = int(self.npoints.text())
         if self.distribOval.isChecked():
-            while len(ptlist) < npoints:
-                x = random.uniform(-1.0, 1.0)
-                y = random.uniform(-1.0, 1.0)
-                if x ** 2 + y ** 2 <= max_r ** 2:
-                    xval = WIDTH * x
-                    yval = HEIGHT * y
-                    if not xval in unique_xvals:
-                        ptlist.append(QPointF(xval, yval))
-                        unique_xvals[xval] = 1  # dict/map with float keys?
+            distribution = 'uniform'
         elif self.distribSphere.isChecked():
-            while len(ptlist) < npoints:
-                x = random.uniform(-1.0, 1.0)
-                y = random.uniform(-1.0, 1.0)
-                z = random.uniform(-1.0, 1.0)
-                if x ** 2 + y ** 2 + z ** 2 <= max_r ** 2:
-                    xval = WIDTH * x
-                    yval = HEIGHT * y
-                    if not xval in unique_xvals:
-                        ptlist.append(QPointF(xval, yval))
-                        unique_xvals[xval] = 1
-        elif self.distribGaussian.isChecked():
-            while len(ptlist) < npoints:
-                x = random.gauss(0.0, 0.25)
-                y = random.gauss(0.0, 0.25)
-                if x ** 2 + y ** 2 <= max_r ** 2:
-                    xval = WIDTH * x
-                    yval = HEIGHT * y
-                    if not xval in unique_xvals:
-                        ptlist.append(QPointF(xval, yval))
-                        unique_xvals[xval] = 1
-        return ptlist
+            distribution = 'sphere'
+        else:
+            distribution = 'gaussian'
+
+        points = generate_points(npoints, distribution, seed)
+        return [QPointF(x, y) for x, y in points.tolist()]
 
     # Methods that handle GUI events
     def clearClicked(self):
+        self.solver.stopReplay()
         self.view.clearLines()
         self.view.displayStatusText('')
         self.solveButton.setEnabled(True)
@@ -176,6 +212,7 @@ class Proj2GUI(QMainWindow):
         app.processEvents()  # Why is this necessary?????
 
     def generateClicked(self):
+        self.solver.stopReplay()
         if self.points:
             self.view.clearPoints()
             self.view.clearLines()
@@ -188,19 +225,30 @@ class Proj2GUI(QMainWindow):
     # This the method that hooks into your solver.  It passes the
     # problem instance/solution request (a set of points) to the solver, along with
     # the recursion flag to indicate whether to animate the solution
-    # and a view object so the GUI can be updated
+    # and a view object so the GUI can be updated.  The solve runs in the
+    # background; solveDone is called when it's over.
     def solveClicked(self):
         self.generateButton.setEnabled(False)
         self.clearButton.setEnabled(False)
         self.solveButton.setEnabled(False)
-        self.view.update()
-        app.processEvents()  # Why is this necessary?????
+        self.cancelButton.setEnabled(True)
+        self.view.displayStatusText('Solving...')
         self.solver.compute_hull(self.points, self.showRecursion.isChecked(), self.view)
+
+    def solveProgress(self, done, total):
+        self.view.displayStatusText('Solving... {:.0%}'.format(done / total))
+
+    def solveDone(self):
         self.generateButton.setEnabled(True)
         self.clearButton.setEnabled(True)
+        self.cancelButton.setEnabled(False)
         self.view.update()
         app.processEvents()  # Why is this necessary?????
 
+    def cancelClicked(self):
+        self.cancelButton.setEnabled(False)
+        self.solver.cancel()
+
     def _randbytime(self):
         self.randSeed.setEnabled(False)
 
@@ -225,6 +273,8 @@ class Proj2GUI(QMainWindow):
         self.generateButton = QPushButton('Generate')
         self.solveButton = QPushButton('Solve')
         self.clearButton = QPushButton('Clear To Points')
+        self.cancelButton = QPushButton('Cancel')
+        self.cancelButton.setEnabled(False)
         self.distribOval = QRadioButton('Uniform')
         self.distribSphere = QRadioButton('Spherical')
         self.distribGaussian = QRadioButton('Gaussian')
@@ -245,6 +295,7 @@ class Proj2GUI(QMainWindow):
         h.addWidget(self.generateButton)
         h.addWidget(self.solveButton)
         h.addWidget(self.clearButton)
+        h.addWidget(self.cancelButton)
         h.addStretch(1)
         vbox.addLayout(h)
 
@@ -275,6 +326,7 @@ class Proj2GUI(QMainWindow):
         self.generateButton.clicked.connect(self.generateClicked)
         self.solveButton.clicked.connect(self.solveClicked)
         self.clearButton.clicked.connect(self.clearClicked)
+        self.cancelButton.clicked.connect(self.cancelClicked)
 
         self.randByTime.clicked.connect(self._randbytime)
         self.randBySeed.clicked.connect(self._randbyseed)
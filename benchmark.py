@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+
+import argparse
+import csv
+import json
+import math
+import sys
+
+import numpy as np
+
+from convex_hull_core import ENGINES, ORIENTATION_PREDICATES, as_coordinate_arrays, solve_with_engine
+from point_generator import DISTRIBUTIONS, generate_points
+
+#
+# Headless timing of the hull engines, for the "Empirical vs Theoretical" curves
+# in the report and as a baseline to check changes against.  For every
+# distribution, engine and n it times the sort and the hull separately over a
+# number of runs, reports the median and 95th percentile, and fits the constant
+# c in time = c * n log2 n for each distribution and engine.
+#
+#   python benchmark.py --sizes 100 1000 10000 100000 --repeats 5 --csv runs.csv --json runs.json
+#
+
+DEFAULT_SIZES = [100, 1000, 10000, 100000]
+DEFAULT_REPEATS = 5
+
+TIMINGS = ('sort', 'hull', 'total')
+CSV_FIELDS = ['distribution', 'engine', 'n', 'repeats', 'hull_size', 'nlogn_ratio'] + \
+             ['{}_{}'.format(timing, stat) for timing in TIMINGS for stat in ('median', 'p95')]
+
+
+# Times one engine on one point set.  Every run gets the same points, so the
+# spread only comes from the machine.
+def time_engine(xs, ys, engine, repeats, predicate='adaptive', prefilter=False):
+    runs = {timing: [] for timing in TIMINGS}
+    for _ in range(repeats):
+        stats = {}
+        hull = solve_with_engine(xs, ys, engine, predicate, prefilter, stats)
+        runs['sort'].append(stats['prefilter'] + stats['sort'])
+        runs['hull'].append(stats['hull'])
+        runs['total'].append(stats['prefilter'] + stats['sort'] + stats['hull'])
+    return runs, len(hull)
+
+
+# One row per (distribution, engine, n), with the median and 95th percentile of
+# each timing in seconds.  nlogn_ratio is the median total over n log2 n.
+def run_benchmark(sizes=DEFAULT_SIZES, distributions=None, engines=None, repeats=DEFAULT_REPEATS, seed=0,
+                  predicate='adaptive', prefilter=False, log=None):
+    distributions = sorted(DISTRIBUTIONS) if distributions is None else distributions
+    engines = sorted(ENGINES) if engines is None else engines
+
+    rows = []
+    for distribution in distributions:
+        for n in sizes:
+            xs, ys = as_coordinate_arrays(generate_points(n, distribution, seed))
+            for engine in engines:
+                runs, hull_size = time_engine(xs, ys, engine, repeats, predicate, prefilter)
+                row = {'distribution': distribution, 'engine': engine, 'n': n, 'repeats': repeats,
+                       'hull_size': hull_size}
+                for timing in TIMINGS:
+                    row[timing + '_median'] = float(np.median(runs[timing]))
+                    row[timing + '_p95'] = float(np.percentile(runs[timing], 95))
+                row['nlogn_ratio'] = row['total_median'] / _nlogn(n)
+                rows.append(row)
+                if log is not None:
+                    log(row)
+    return rows
+
+
+# Least-squares fit of time = c * n log2 n through the median totals, for each
+# (distribution, engine).  Returns {(distribution, engine): c}.
+def fit_nlogn(rows):
+    sums = {}
+    for row in rows:
+        key = (row['distribution'], row['engine'])
+        f = _nlogn(row['n'])
+        ft, ff = sums.get(key, (0.0, 0.0))
+        sums[key] = (ft + f * row['total_median'], ff + f * f)
+    return {key: ft / ff for key, (ft, ff) in sums.items() if ff > 0}
+
+
+def _nlogn(n):
+    return n * math.log2(n) if n > 1 else 1.0
+
+
+def write_csv(rows, path):
+    with open(path, 'w', newline='') as file:
+        writer = csv.DictWriter(file, fieldnames=CSV_FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def write_json(rows, fits, path):
+    report = {
+        'runs': rows,
+        'nlogn_constants': [{'distribution': distribution, 'engine': engine, 'constant': constant}
+                            for (distribution, engine), constant in sorted(fits.items())],
+    }
+    with open(path, 'w') as file:
+        json.dump(report, file, indent=2)
+
+
+def _print_row(row):
+    print('{distribution:>9} {engine:>10} {n:>9} {hull_size:>6}  sort {sort_median:9.5f} / {sort_p95:9.5f}  '
+          'hull {hull_median:9.5f} / {hull_p95:9.5f}  t/(n log n) {nlogn_ratio:.3e}'.format(**row))
+    sys.stdout.flush()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Time the convex hull engines over a sweep of input sizes.')
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES)
+    parser.add_argument('--distributions', nargs='+', choices=sorted(DISTRIBUTIONS), default=None)
+    parser.add_argument('--engines', nargs='+', choices=sorted(ENGINES) + ['auto'], default=None)
+    parser.add_argument('--repeats', type=int, default=DEFAULT_REPEATS)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--predicate', choices=sorted(ORIENTATION_PREDICATES), default='adaptive')
+    parser.add_argument('--prefilter', action='store_true', help='drop interior points first (counted as sort time)')
+    parser.add_argument('--csv', help='write one row per run configuration to this file')
+    parser.add_argument('--json', help='write the runs and the fitted n log n constants to this file')
+    args = parser.parse_args(argv)
+
+    print('{:>9} {:>10} {:>9} {:>6}  timings in seconds, median / p95'.format('dist', 'engine', 'n', 'hull'))
+    rows = run_benchmark(args.sizes, args.distributions, args.engines, args.repeats, args.seed, args.predicate,
+                         args.prefilter, log=_print_row)
+    fits = fit_nlogn(rows)
+
+    print()
+    for (distribution, engine), constant in sorted(fits.items()):
+        print('{:>9} {:>10}  time ~ {:.3e} * n log2 n'.format(distribution, engine, constant))
+
+    if args.csv:
+        write_csv(rows, args.csv)
+    if args.json:
+        write_json(rows, fits, args.json)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,14 +1,19 @@
 from which_pyqt import PYQT_VER
 
 if PYQT_VER == 'PYQT5':
-    from PyQt5.QtCore import QLineF, QPointF, QObject
+    from PyQt5.QtCore import QLineF, QPointF, QObject, QThread, QTimer, pyqtSignal
 elif PYQT_VER == 'PYQT4':
-    from PyQt4.QtCore import QLineF, QPointF, QObject
+    from PyQt4.QtCore import QLineF, QPointF, QObject, QThread, QTimer, pyqtSignal
 else:
     raise Exception('Unsupported Version of PyQt: {}'.format(PYQT_VER))
 
 import time
-from functools import cmp_to_key
+from functools import partial
+
+import numpy as np
+
+from convex_hull_core import HullTrace, SolveCancelled
+from convex_hull_solver import HullSolver, profile_stats
 
 # Some global color constants that might be useful
 RED = (255, 0, 0)
@@ -17,209 +22,152 @@ BLUE = (0, 0, 255)
 YELLOW = (255, 255, 0)
 
 # Global variable that controls the speed of the recursion automation, in seconds
+# per recorded step.  The solve itself never waits; see replayTrace.
 #
 PAUSE = 0.25
 
 
 #
-# This is the class you have to complete.
+# Runs one solve on a QThread.  solve is called with this worker's
+# reportProgress and returns (hull, stats).  The signals are delivered to the
+# GUI thread as queued events, so nothing here ever touches a widget.
 #
-class ConvexHullSolver(QObject):
+class HullWorker(QObject):
+    progress = pyqtSignal(int, int)  # points merged so far, total points
+    finished = pyqtSignal(object, object)  # hull, stats
+    cancelled = pyqtSignal()
+    failed = pyqtSignal(str)
+
+    def __init__(self, solve):
+        super().__init__()
+        self.solve = solve
+        self.cancelRequested = False
+
+    def run(self):
+        try:
+            hull, stats = self.solve(self.reportProgress)
+        except SolveCancelled:
+            self.cancelled.emit()
+            return
+        except Exception as error:
+            self.failed.emit('{}: {}'.format(type(error).__name__, error))
+            return
+
+        # Engines that don't report progress can only be cancelled once they're done
+        if self.cancelRequested:
+            self.cancelled.emit()
+        else:
+            self.finished.emit(hull, stats)
+
+    # Called from the solve, on the worker thread.  Cancelling just sets a flag
+    # that the next call turns into a SolveCancelled.
+    def reportProgress(self, done, total):
+        if self.cancelRequested:
+            raise SolveCancelled()
+        self.progress.emit(done, total)
+
+    def cancel(self):
+        self.cancelRequested = True
+
 
-    # Class constructor
-    def __init__(self):
+#
+# This is the class you have to complete.  The geometry lives in
+# convex_hull_solver.HullSolver, which needs no PyQt; this is the Qt side of it,
+# running that solve on a QThread and drawing the results on the view.
+#
+class ConvexHullSolver(QObject):
+    progress = pyqtSignal(int, int)  # forwarded from the worker
+    solved = pyqtSignal()  # the solve has finished, failed or been cancelled
+    profiled = pyqtSignal(object)  # the stats dict, after each solve when collect_stats is on
+
+    # Class constructor.  The options are HullSolver's.  With collect_stats on,
+    # each solve leaves its phase times in self.stats (and emits them on
+    # profiled), along with convex_hull_core.InstrumentedHullSolver's counters
+    # when the serial divide and conquer did the work.
+    def __init__(self, engine='dc', prefilter=False, workers=1, parallel_threshold=None, collect_stats=False,
+                 cache=None):
         super().__init__()
         self.pause = False
+        self.hull_solver = HullSolver(engine, prefilter, workers, parallel_threshold, collect_stats, cache)
+        self.stats = None
+        self.timer = None
+        self.thread = None
+        self.worker = None
 
     # Some helper methods that make calls to the GUI, allowing us to send updates
-    # to be displayed.
+    # to be displayed.  show* return a handle for the lines, which is what
+    # erase* take to remove them.
 
     def showTangent(self, line, color):
-        self.view.addLines(line, color)
-        if self.pause:
-            time.sleep(PAUSE)
+        return self.view.addLines(line, color)
 
-    def eraseTangent(self, line):
-        self.view.clearLines(line)
+    def eraseTangent(self, handle):
+        self.view.clearLines(handle)
 
     def blinkTangent(self, line, color):
-        self.showTangent(line, color)
-        self.eraseTangent(line)
+        self.eraseTangent(self.showTangent(line, color))
 
     def showHull(self, polygon, color):
-        self.view.addLines(polygon, color)
-        if self.pause:
-            time.sleep(PAUSE)
+        return self.view.addLines(polygon, color)
 
-    def eraseHull(self, polygon):
-        self.view.clearLines(polygon)
+    def eraseHull(self, handle):
+        self.view.clearLines(handle)
 
     def showText(self, text):
         self.view.displayStatusText(text)
 
-    # Function Time Complexity: We will call this recursive function a max of log(n) times because each time the size of n is halved.  Each recursive call will then have a O(n + n + n) due to the function calls and opportations.  This combines to be O(3n) * O(log n) = O(3n log n) = O(n log n)
-    # Function Space Complexity: O(2n) because in the worst case scenario we have n edges and points
-    def solve_hull(self, points):
-        num_points = len(points)
-
-        if num_points <= 3:  # base case
-            if len(points) is 3:
-                hull = [None] * 3
-                hull[0] = points[0]
-
-                slope1 = self.get_slope(points[0], points[1])
-                slope2 = self.get_slope(points[0], points[2])
-
-                if slope2 > slope1:
-                    hull[1] = points[2]
-                    hull[2] = points[1]
-                else:
-                    hull[1] = points[1]
-                    hull[2] = points[2]
-
-                return hull
-
-            else:  # if 2 or 1 points
-                return points
-
-        left_hull = self.solve_hull(points[:num_points//2])
-        right_hull = self.solve_hull(points[num_points//2:num_points + 1])
-
-        return self.combine_hull(left_hull, right_hull)
-
-    # Function Time Complexity: 4n = n
-    # Function Space Complexity: 2n = n
-    def combine_hull(self, left_hull, right_hull):
-        upper_tan, left_hull_start_index, right_hull_end_index = self.find_upper_tangent(left_hull, right_hull)
-        lower_tan, left_hull_ending_index, right_hull_starting_index = self.find_lower_tangent(left_hull, right_hull)
-
-        # self.showTangent(self.points_to_lines(left_hull), BLUE)
-        # self.showTangent(self.points_to_lines(right_hull), BLUE)
-        # self.showTangent(self.points_to_lines(upper_tan), YELLOW)
-        # self.showTangent(self.points_to_lines(lower_tan), YELLOW)
-
-        combined_hull = []
-
-        found_lower_tangent_point = False
-
-        j = right_hull_end_index
-
-        while found_lower_tangent_point is False:  # bigO(n) bc the furthest distance is the whole hull
-            combined_hull.append(right_hull[j])
-            if right_hull[j] == lower_tan[1]:
-                found_lower_tangent_point = True
-            j = (j + 1) % len(right_hull)
-
-        i = left_hull_ending_index
-        while i is not len(left_hull):  # bigO(n) bc the furthest distance is the whole hull
-            combined_hull.append(left_hull[i])
-            i = (i + 1) % len(left_hull)
-
-        return combined_hull
-
-    # Function Time Complexity: 3n = n (The loops)
-    # Function Space Complexity: 2n = n (the two halves)
-    def find_upper_tangent(self, left_hull, right_hull):
-        left_tan, right_tan = False, False
-
-        left_hull_index = self.get_point_index(left_hull, "right")
-        right_hull_index = self.get_point_index(right_hull, "left")
-
-        current_slope = self.get_slope(left_hull[left_hull_index], right_hull[right_hull_index])
-        # self.showTangent(self.points_to_lines(left_hull), RED)
-        # self.showTangent(self.points_to_lines(right_hull), BLUE)
-
-        while not left_tan and not right_tan:
-            while not left_tan:  # Total iteration can be all of the left and right hull, thus 2n
-                # self.showTangent([QLineF(left_hull[left_hull_index], right_hull[right_hull_index])], GREEN)
-                left_hull_index = (left_hull_index - 1) % len(left_hull)
-                # self.showTangent([QLineF(left_hull[left_hull_index], right_hull[right_hull_index])], YELLOW)
-                new_slope = self.get_slope(left_hull[left_hull_index], right_hull[right_hull_index])
-                if new_slope < current_slope:
-                    left_tan, right_tan = False, False
-                    current_slope = new_slope
-                else:
-                    left_tan = True
-                    left_hull_index = (left_hull_index + 1) % len(left_hull)  # Since we can't move up anymore we use the last good index
-
-            while not right_tan: # Total iteration can be n
-                # self.showTangent([QLineF(left_hull[left_hull_index], right_hull[right_hull_index])], RED)
-                right_hull_index = (right_hull_index + 1) % len(right_hull)
-                # self.showTangent([QLineF(left_hull[left_hull_index], right_hull[right_hull_index])], BLUE)
-                new_slope = self.get_slope(left_hull[left_hull_index], right_hull[right_hull_index])
-                if new_slope > current_slope:
-                    left_tan, right_tan = False, False
-                    current_slope = new_slope
-                else:
-                    right_tan = True
-                    right_hull_index = (right_hull_index - 1) % len(right_hull)  # Since we can't move up anymore we use the last good index
-
-        # self.showTangent([QLineF(left_hull[left_hull_index], right_hull[right_hull_index])], BLUE)
-        return [left_hull[left_hull_index], right_hull[right_hull_index]], left_hull_index, right_hull_index
-
-    # Function Time and Space Complexity are the same as the upper tan func (see above)
-    def find_lower_tangent(self, left_hull, right_hull):
-        left_tan, right_tan = False, False
-
-        left_hull_index = self.get_point_index(left_hull, "right")
-        right_hull_index = self.get_point_index(right_hull, "left")
-
-        current_slope = self.get_slope(left_hull[left_hull_index], right_hull[right_hull_index])
-        # self.showTangent(self.points_to_lines(left_hull), RED)
-        # self.showTangent(self.points_to_lines(right_hull), BLUE)
-
-        while not left_tan and not right_tan:
-            while not left_tan:
-                # self.showTangent([QLineF(left_hull[left_hull_index], right_hull[right_hull_index])], GREEN)
-                left_hull_index = (left_hull_index + 1) % len(left_hull)
-                # self.showTangent([QLineF(left_hull[left_hull_index], right_hull[right_hull_index])], YELLOW)
-                new_slope = self.get_slope(left_hull[left_hull_index], right_hull[right_hull_index])
-                if new_slope > current_slope:
-                    left_tan, right_tan = False, False
-                    current_slope = new_slope
-                else:
-                    left_tan = True
-                    left_hull_index = (left_hull_index - 1) % len(left_hull)  # Since we can't move up anymore we use the last good index
-
-            while not right_tan:
-                # self.showTangent([QLineF(left_hull[left_hull_index], right_hull[right_hull_index])], RED)
-                right_hull_index = (right_hull_index - 1) % len(right_hull)
-                # self.showTangent([QLineF(left_hull[left_hull_index], right_hull[right_hull_index])], BLUE)
-                new_slope = self.get_slope(left_hull[left_hull_index], right_hull[right_hull_index])
-                if new_slope < current_slope:
-                    left_tan, right_tan = False, False
-                    current_slope = new_slope
-                else:
-                    right_tan = True
-                    right_hull_index = (right_hull_index + 1) % len(right_hull)  # Since we can't move up anymore we use the last good index
-
-        # self.showTangent([QLineF(left_hull[left_hull_index], right_hull[right_hull_index])], BLUE)
-        return [left_hull[left_hull_index], right_hull[right_hull_index]], left_hull_index, right_hull_index
-
-    # Function Time Complexity: c
-    # Function Space Complexity: c
-    def get_slope(self, point1, point2):
-        return (point2.y() - point1.y()) / (point2.x() - point1.x())  # Slope = change in y / change in x
-
-    # Function Time Complexity: n
-    # Function Space Complexity: n
-    def get_point_index(self, hull, direction):
-        index = 0
-        record = hull[0].x()
-
-        # Either direction will have a big o of n because we have to iterate through everything
-        if direction is "right":
-            for i in range(0, len(hull) - 1):
-                if hull[i].x() > record:
-                    index = i
-                    record = hull[i].x()
-        elif direction is "left":
-            for i in range(0, len(hull) - 1):
-                if hull[i].x() < record:
-                    index = i
-                    record = hull[i].x()
-
-        return index
+    # Animates a HullTrace recorded during the solve, one step every PAUSE
+    # seconds on a QTimer, and then shows the final hull and status text.  Each
+    # sub-hull replaces the ones it was merged from, and tangents stay up until
+    # the merge they belong to is shown.
+    def replayTrace(self, trace, points, polygon, text):
+        self.stopReplay()
+        self.replayEvents = iter(trace)
+        self.replayPoints = points
+        self.replayResult = (polygon, text)
+        self.replayHulls = {}  # first order position -> (last order position, handle) on screen
+        self.replayTangents = []
+
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.replayStep)
+        self.timer.start(int(PAUSE * 1000))
+
+    def replayStep(self):
+        event = next(self.replayEvents, None)
+        if event is None:
+            self.stopReplay()
+            polygon, text = self.replayResult
+            self.showHull(polygon, RED)
+            self.showText(text)
+            return
+
+        if event[0] == HullTrace.TANGENT:
+            _, a, b = event
+            line = [QLineF(self.replayPoints[a], self.replayPoints[b])]
+            self.replayTangents.append(self.showTangent(line, YELLOW))
+            return
+
+        _, lo, hi, corners = event
+        for handle in self.replayTangents:
+            self.eraseTangent(handle)
+        self.replayTangents = []
+        for start in [start for start in self.replayHulls if lo <= start < hi]:
+            self.eraseHull(self.replayHulls.pop(start)[1])
+        polygon = self.points_to_lines([self.replayPoints[i] for i in corners])
+        self.replayHulls[lo] = (hi, self.showHull(polygon, BLUE))
+
+    # Stops an animation that is still running and takes its lines down
+    def stopReplay(self):
+        if self.timer is None:
+            return
+        self.timer.stop()
+        self.timer = None
+        for handle in self.replayTangents:
+            self.eraseTangent(handle)
+        for _, handle in self.replayHulls.values():
+            self.eraseHull(handle)
+        self.replayHulls = {}
+        self.replayTangents = []
 
     # Function Time Complexity: n
     # Function Space Complexity: 2n = n
@@ -233,34 +181,82 @@ class ConvexHullSolver(QObject):
         return lines
 
     # This is the method that gets called by the GUI and actually executes
-    # the finding of the hull
+    # the finding of the hull.  It returns straight away: the solve runs on a
+    # QThread, and the hull is drawn (and solved emitted) when it's done.
     def compute_hull(self, points, pause, view):
         self.pause = pause
         self.view = view
         assert (type(points) == list and type(points[0]) == QPointF)
-
-        def compare(item1,
-                    item2):  # https://stackoverflow.com/questions/5213033/sort-a-list-of-lists-with-a-custom-compare-function
-            if item1.x() < item2.x():
-                return -1  # return a negative value (< 0) when the left item should be sorted before the right item
-            elif item2.x() < item1.x():
-                return 1  # return a positive value (> 0) when the left item should be sorted after the right item
-            else:
-                return 0  # return 0 when both the left and the right item have the same weight and should be ordered "equally" without precedence
-
+        assert self.thread is None, 'a solve is already running'
+
+        # Pull the coordinates out of the QPointFs once, up front; everything
+        # after this works on the float64 buffers and indices into them
+        xs = np.fromiter((point.x() for point in points), dtype=np.float64, count=len(points))
+        ys = np.fromiter((point.y() for point in points), dtype=np.float64, count=len(points))
+
+        # With "Show Recursion" on, the divide and conquer records its steps to be
+        # animated after it has finished
+        self.points = points
+        self.trace = HullTrace() if pause else None
+
+        self.thread = QThread()
+        self.worker = HullWorker(partial(self.hull_solver.solve, xs, ys, self.trace))
+        self.worker.moveToThread(self.thread)
+        self.worker.progress.connect(self.progress)
+        self.worker.finished.connect(self.solveFinished)
+        self.worker.cancelled.connect(self.solveCancelled)
+        self.worker.failed.connect(self.solveFailed)
+        self.thread.started.connect(self.worker.run)
+        self.thread.start()
+
+    # Asks the running solve to stop; solved is emitted once it has
+    def cancel(self):
+        if self.worker is not None:
+            self.worker.cancel()
+
+    def solveFinished(self, hull, stats):
+        self.endSolve()
+        points = self.points
         t1 = time.time()
-        # SORT THE POINTS BY INCREASING X-VALUE
-        sorted_points = sorted(points, key=cmp_to_key(compare))  # Uses timsort algor, which is on average O(n log n)
+        polygon = self.points_to_lines([points[i] for i in hull])  # n
         t2 = time.time()
 
-        t3 = time.time()
-        # this is a dummy polygon of the first 3 unsorted points
-        # polygon = [QLineF(sortedPoints[i], sortedPoints[(i + 1) % 3]) for i in range(3)]
-        # REPLACE THE LINE ABOVE WITH A CALL TO YOUR DIVIDE-AND-CONQUER CONVEX HULL SOLVER
-        polygon = self.points_to_lines(self.solve_hull(sorted_points))  # n + n +
-        t4 = time.time()
+        text = 'Time Elapsed (Convex Hull): {:3.3f} sec (Sort: {:3.3f} sec)'.format(stats['hull'], stats['sort'])
+        if stats['cached']:
+            text = 'Convex Hull from cache in {:3.3f} sec'.format(stats['cache'])
+        elif self.hull_solver.prefilter:
+            text += ' ({} of {} points culled in {:3.3f} sec)'.format(stats['culled'], len(points), stats['prefilter'])
 
         # when passing lines to the display, pass a list of QLineF objects.  Each QLineF
         # object can be created with two QPointF objects corresponding to the endpoints
-        self.showHull(polygon, RED)
-        self.showText('Time Elapsed (Convex Hull): {:3.3f} sec'.format(t4 - t3))
+        if self.trace is None:
+            self.showHull(polygon, RED)
+            self.showText(text)
+        else:
+            self.replayTrace(self.trace, points, polygon, text)
+
+        # Painting happens later, on the view's next paint event, so it isn't
+        # timed here
+        if self.hull_solver.collect_stats:
+            self.stats = profile_stats(stats, len(points), len(hull))
+            self.stats['polygon'] = t2 - t1
+            self.profiled.emit(self.stats)
+        self.solved.emit()
+
+    def solveCancelled(self):
+        self.endSolve()
+        self.showText('Solve cancelled')
+        self.solved.emit()
+
+    def solveFailed(self, message):
+        self.endSolve()
+        self.showText('Solve failed: {}'.format(message))
+        self.solved.emit()
+
+    # The worker has returned by the time any of its signals arrive, so the
+    # thread stops right away
+    def endSolve(self):
+        self.thread.quit()
+        self.thread.wait()
+        self.thread = None
+        self.worker = None
@@ -0,0 +1,91 @@
+import numpy as np
+
+from convex_hull_core import as_coordinate_arrays, monotone_chain_rows, solve_with_engine
+
+#
+# Hulls of many small point sets at once.  A batch is one flat coordinate buffer
+# plus an offsets array: instance k is points offsets[k]:offsets[k + 1].
+#
+# Rather than a Python call (and a sort, and a stack walk) per instance, the
+# instances are grouped by size and each group is padded out into the rows of a
+# matrix, and convex_hull_core.monotone_chain_rows finds the chains of every row
+# together.  The number of numpy calls grows with the width of the group, not
+# with the number of instances in it.
+#
+
+# Instances with more points than this are solved one at a time with
+# convex_hull_core.solve_with_engine, where the per-call overhead no longer
+# matters and the lockstep walk would take too many steps
+BATCH_WIDTH_LIMIT = 64
+
+
+# Takes an (N, 2) array (or x and y buffers) and offsets of length k + 1, with
+# offsets[0] == 0 and offsets[-1] == N.  Returns (hulls, hull_offsets) in the
+# same layout: hulls[hull_offsets[k]:hull_offsets[k + 1]] is the hull of
+# instance k as indices into the flat input, clockwise from its lexicographically
+# smallest point, exactly as compute_hull_indices would give for it alone.
+# Function Time Complexity: N log (largest instance)
+# Function Space Complexity: N
+def compute_hulls(points, offsets, ys=None, predicate='adaptive'):
+    xs, ys = as_coordinate_arrays(points, ys)
+    offsets = np.asarray(offsets, dtype=np.intp)
+    if offsets.ndim != 1 or len(offsets) == 0 or offsets[0] != 0 or offsets[-1] != len(xs) or \
+            np.any(np.diff(offsets) < 0):
+        raise ValueError('offsets must be non-decreasing, start at 0 and end at the number of points ({})'.format(
+            len(xs)))
+    sizes = np.diff(offsets)
+    hull_sizes = np.zeros(len(sizes), dtype=np.intp)
+
+    # Each group's hulls as a matrix, one row per instance, plus the length of
+    # each row's hull
+    groups = []
+    for members in _size_groups(sizes):
+        matrix, lengths = _solve_group(xs, ys, offsets[members], sizes[members], predicate)
+        hull_sizes[members] = lengths
+        groups.append((members, matrix, lengths))
+
+    large = []
+    for member in np.flatnonzero(sizes > BATCH_WIDTH_LIMIT).tolist():
+        lo, hi = offsets[member], offsets[member + 1]
+        hull = solve_with_engine(xs[lo:hi], ys[lo:hi], 'auto', predicate) + lo
+        hull_sizes[member] = len(hull)
+        large.append((member, hull))
+
+    hull_offsets = np.zeros(len(sizes) + 1, dtype=np.intp)
+    np.cumsum(hull_sizes, out=hull_offsets[1:])
+    hulls = np.empty(hull_offsets[-1], dtype=np.intp)
+    for members, matrix, lengths in groups:
+        columns = np.arange(matrix.shape[1], dtype=np.intp)
+        filled = columns < lengths[:, None]
+        hulls[(hull_offsets[members, None] + columns)[filled]] = matrix[filled]
+    for member, hull in large:
+        hulls[hull_offsets[member]:hull_offsets[member + 1]] = hull
+    return hulls, hull_offsets
+
+
+# Splits the non-empty instances of up to BATCH_WIDTH_LIMIT points into groups
+# of similar size (between successive powers of two), so padding a group out to
+# its widest instance at most doubles it
+def _size_groups(sizes):
+    small = (sizes > 0) & (sizes <= BATCH_WIDTH_LIMIT)
+    size_classes = np.zeros(len(sizes), dtype=np.intp)
+    size_classes[small] = np.ceil(np.log2(sizes[small]))
+    return [np.flatnonzero(small & (size_classes == size_class))
+            for size_class in np.unique(size_classes[small]).tolist()]
+
+
+# Hulls of a group of instances, given where each starts in the batch and how
+# many points it has.  Returns a matrix with each instance's hull at the start
+# of its row, and the hull lengths.
+def _solve_group(xs, ys, starts, sizes, predicate):
+    columns = np.arange(sizes.max(), dtype=np.intp)
+    valid = columns < sizes[:, None]
+    points = np.where(valid, starts[:, None] + columns, 0)
+    upper, upper_sizes, lower, lower_sizes = monotone_chain_rows(xs, ys, points, valid, predicate)
+
+    # The hull is the upper chain, then the lower chain without its two ends
+    # (which the upper chain already has)
+    matrix = np.concatenate((upper, upper), axis=1)
+    rows, places = np.nonzero((columns >= 1) & (columns < lower_sizes[:, None] - 1))
+    matrix[rows, upper_sizes[rows] + places - 1] = lower[rows, places]
+    return matrix, upper_sizes + np.maximum(lower_sizes - 2, 0)
@@ -0,0 +1,141 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+#
+# Content-addressed cache of solved hulls.  A hull is filed under a digest of
+# the exact bytes of its x and y buffers plus the options it was solved with,
+# so the same points (the same seeded point set, the same file read again) find
+# it whatever object they arrive in.  The memory tier is an LRU bounded by the
+# bytes of the hulls it holds; with a directory given, every hull is also
+# written there as <key>.npy, and memory misses are looked up on disk before
+# counting as misses.  convex_hull_solver.HullSolver takes one as its cache.
+#
+
+# Default bound on the memory tier: 64 MB of hull indices
+DEFAULT_CACHE_BYTES = 1 << 26
+
+
+# The cache key for a point set: SHA-256 (which runs at memory speed on
+# anything with SHA instructions) of the length, the options and both
+# coordinate buffers.  The options only need to be repr-able.
+# Function Time Complexity: n
+# Function Space Complexity: c
+def hull_key(xs, ys, **options):
+    digest = hashlib.sha256()
+    digest.update(repr(sorted(options.items())).encode())
+    digest.update(len(xs).to_bytes(8, 'little'))
+    digest.update(memoryview(np.ascontiguousarray(xs, dtype=np.float64)))
+    digest.update(memoryview(np.ascontiguousarray(ys, dtype=np.float64)))
+    return digest.hexdigest()
+
+
+class HullCache:
+
+    # max_bytes bounds the memory tier; directory, if given, is created if
+    # needed and holds the disk tier, which isn't bounded
+    def __init__(self, max_bytes=DEFAULT_CACHE_BYTES, directory=None):
+        self.max_bytes = max_bytes
+        self.directory = directory
+        self.entries = OrderedDict()  # key -> hull, least recently used first
+        self.num_bytes = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = threading.Lock()  # solves run on worker threads
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, key):
+        return key in self.entries or (self.directory is not None and os.path.exists(self._path(key)))
+
+    # The hull filed under key (a copy, so callers are free to change it), or
+    # None.  A hull found on disk is moved into the memory tier.
+    # Function Time Complexity: h
+    # Function Space Complexity: h
+    def get(self, key):
+        with self.lock:
+            hull = self.entries.get(key)
+            if hull is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return hull.copy()
+
+        hull = self._load(key)
+        with self.lock:
+            if hull is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+            self._remember(key, hull)
+        return hull.copy()
+
+    # Files a hull under key, in memory and (if there is one) on disk
+    # Function Time Complexity: h
+    # Function Space Complexity: h
+    def put(self, key, hull):
+        hull = np.array(hull, dtype=np.intp)
+        with self.lock:
+            self._remember(key, hull)
+        if self.directory is not None:
+            self._save(key, hull)
+
+    # Empties the memory tier (and, with disk=True, the disk tier as well)
+    def clear(self, disk=False):
+        with self.lock:
+            self.entries.clear()
+            self.num_bytes = 0
+        if disk and self.directory is not None:
+            for name in os.listdir(self.directory):
+                if name.endswith('.npy'):
+                    os.remove(os.path.join(self.directory, name))
+
+    # Hit and miss counts and how full the memory tier is, as a dict
+    def stats(self):
+        with self.lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {'hits': self.hits, 'disk_hits': self.disk_hits, 'misses': self.misses,
+                    'hit_rate': (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+                    'evictions': self.evictions, 'entries': len(self.entries), 'bytes': self.num_bytes}
+
+    # Adds to the memory tier and evicts from its old end until it fits.  A hull
+    # bigger than the whole bound isn't kept in memory at all.  Call with the
+    # lock held.
+    def _remember(self, key, hull):
+        if key in self.entries:
+            self.num_bytes -= self.entries.pop(key).nbytes
+        if hull.nbytes > self.max_bytes:
+            return
+        self.entries[key] = hull
+        self.num_bytes += hull.nbytes
+        while self.num_bytes > self.max_bytes:
+            _, evicted = self.entries.popitem(last=False)
+            self.num_bytes -= evicted.nbytes
+            self.evictions += 1
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + '.npy')
+
+    def _load(self, key):
+        if self.directory is None:
+            return None
+        try:
+            return np.load(self._path(key))
+        except (OSError, ValueError):  # not there, or a partly written or damaged file
+            return None
+
+    # Writes to a temporary file and renames it into place, so a reader never
+    # sees half a hull
+    def _save(self, key, hull):
+        path = self._path(key)
+        temporary = '{}.{}.{}.tmp'.format(path, os.getpid(), threading.get_ident())
+        with open(temporary, 'wb') as file:
+            np.save(file, hull)
+        os.replace(temporary, path)
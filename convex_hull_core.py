@@ -0,0 +1,973 @@
+import time
+from array import array
+from fractions import Fraction
+
+try:
+    import numpy as np
+except ImportError:  # only the pure Python path in convex_hull_pure works without it
+    np = None
+
+#
+# Array-backed divide-and-conquer convex hull.
+#
+# Everything in here works on plain coordinate buffers and integer indices
+# into them, so it can be used without PyQt (and without boxing every point
+# into a QPointF).  Hulls are lists of indices in clockwise order, starting
+# from the leftmost point, which is the same ordering ConvexHullSolver draws.
+#
+
+
+# Turns the accepted inputs (an (N, 2) array, or separate x and y buffers) into
+# a pair of contiguous float64 arrays
+def as_coordinate_arrays(points, ys=None):
+    if ys is None:
+        points = np.asarray(points, dtype=np.float64)
+        if points.ndim != 2 or points.shape[1] != 2:
+            raise ValueError('Expected an (N, 2) array of points, got shape {}'.format(points.shape))
+        xs, ys = points[:, 0], points[:, 1]
+    else:
+        xs = np.asarray(points, dtype=np.float64)
+        ys = np.asarray(ys, dtype=np.float64)
+        if xs.ndim != 1 or xs.shape != ys.shape:
+            raise ValueError('x and y buffers must be 1-D and the same length, got {} and {}'.format(xs.shape, ys.shape))
+    return np.ascontiguousarray(xs), np.ascontiguousarray(ys)
+
+
+# Index buffers for the divide and conquer: intp numpy arrays, or the standard
+# library's C long arrays when numpy isn't installed.  Either way they're flat
+# machine integers, read and written through memoryviews.
+def _index_buffer(size):
+    if np is None:
+        return array('l', bytes(size * array('l').itemsize))
+    return np.empty(size, dtype=np.intp)
+
+
+def _index_array(indices):
+    if np is None:
+        return array('l', indices)
+    return np.array(indices, dtype=np.intp)
+
+
+# Sorts by increasing x, breaking ties on y, and returns the permutation rather
+# than moving any points around.  lexsort compares the raw float64 columns in C,
+# so no Python comparison function is called per comparison.  Exact duplicates
+# end up next to each other and only the first of each run is kept, since a
+# point can only be on the hull once.
+# Function Time Complexity: n log n
+# Function Space Complexity: n
+def presort(xs, ys):
+    order = np.lexsort((ys, xs))
+    if len(order) < 2:
+        return order
+
+    sorted_xs = xs[order]
+    sorted_ys = ys[order]
+    keep = np.empty(len(order), dtype=bool)
+    keep[0] = True
+    np.not_equal(sorted_xs[1:], sorted_xs[:-1], out=keep[1:])
+    keep[1:] |= sorted_ys[1:] != sorted_ys[:-1]
+    return order[keep]
+
+
+#
+# Orientation predicates.  Each returns a value whose sign says which way the
+# path a -> b -> c turns: positive if c is to the left of the line a -> b
+# (counter-clockwise), negative if it is to the right, and 0 if the three points
+# are collinear.  Unlike comparing slopes there is no division, so points that
+# share an x value are fine.
+#
+
+# Plain floating point cross product.  Fastest, but can get the sign wrong when
+# the points are (nearly) collinear.
+# Function Time Complexity: c
+# Function Space Complexity: c
+def orient_fast(xs, ys, a, b, c):
+    return (xs[b] - xs[a]) * (ys[c] - ys[a]) - (ys[b] - ys[a]) * (xs[c] - xs[a])
+
+
+# Exact cross product using rationals; floats convert to Fractions without any
+# rounding, so the sign is always right.
+# Function Time Complexity: c (but a big one)
+# Function Space Complexity: c
+def orient_exact(xs, ys, a, b, c):
+    det = _exact_det(xs, ys, a, b, c)
+    return (det > 0) - (det < 0)
+
+
+# The exact cross product itself, as a Fraction, for when its size matters too
+def _exact_det(xs, ys, a, b, c):
+    ax, ay = Fraction(xs[a]), Fraction(ys[a])
+    return (Fraction(xs[b]) - ax) * (Fraction(ys[c]) - ay) - (Fraction(ys[b]) - ay) * (Fraction(xs[c]) - ax)
+
+
+# Bound on the rounding error of the floating point cross product, relative to
+# the magnitude of its two terms (Shewchuk's ccwerrboundA)
+_EPSILON = 2.0 ** -53
+_ORIENT_ERROR_BOUND = (3.0 + 16.0 * _EPSILON) * _EPSILON
+
+
+# Floating point cross product that falls back to the exact one only when the
+# result is too close to 0 for its sign to be trusted
+# Function Time Complexity: c
+# Function Space Complexity: c
+def orient_adaptive(xs, ys, a, b, c):
+    ax, ay = xs[a], ys[a]
+    det_left = (xs[b] - ax) * (ys[c] - ay)
+    det_right = (ys[b] - ay) * (xs[c] - ax)
+    det = det_left - det_right
+
+    # If the two terms have opposite signs (or one is 0) the subtraction can't
+    # cancel, so the sign of det is already right
+    if det_left > 0:
+        if det_right <= 0:
+            return det
+        det_sum = det_left + det_right
+    elif det_left < 0:
+        if det_right >= 0:
+            return det
+        det_sum = -det_left - det_right
+    else:
+        return det
+
+    error_bound = _ORIENT_ERROR_BOUND * det_sum
+    if det >= error_bound or -det >= error_bound:
+        return det
+    return orient_exact(xs, ys, a, b, c)
+
+
+ORIENTATION_PREDICATES = {
+    'fast': orient_fast,
+    'adaptive': orient_adaptive,
+    'exact': orient_exact,
+}
+
+
+# Looks up one of the predicates above by name
+def get_orientation_predicate(predicate):
+    try:
+        return ORIENTATION_PREDICATES[predicate]
+    except KeyError:
+        raise ValueError('Unknown orientation predicate {!r}, expected one of {}'.format(
+            predicate, ', '.join(sorted(ORIENTATION_PREDICATES)))) from None
+
+
+#
+# Record of the steps the divide and conquer took, for the GUI to animate
+# afterwards.  Events go into a preallocated numpy buffer (grown by doubling if
+# it fills up), one row of (kind, a, b, c) each:
+#   TANGENT: a tangent was found between points a and b
+#   HULL:    the points in order positions [a, b) now have the hull made of the
+#            next c entries of the corner buffer
+# Recording never calls into Qt, so it costs the solve next to nothing.
+#
+class HullTrace:
+    TANGENT = 0
+    HULL = 1
+
+    def __init__(self, capacity=1024):
+        self.events = np.empty((capacity, 4), dtype=np.intp)
+        self.corners = np.empty(capacity, dtype=np.intp)
+        self.num_events = 0
+        self.num_corners = 0
+
+    def __len__(self):
+        return self.num_events
+
+    def tangent(self, a, b):
+        self._add_event(self.TANGENT, a, b, 0)
+
+    def hull(self, lo, hi, corners):
+        size = len(corners)
+        if self.num_corners + size > len(self.corners):
+            self.corners = np.resize(self.corners, max(2 * len(self.corners), self.num_corners + size))
+        self.corners[self.num_corners:self.num_corners + size] = corners
+        self.num_corners += size
+        self._add_event(self.HULL, lo, hi, size)
+
+    def _add_event(self, kind, a, b, c):
+        if self.num_events == len(self.events):
+            self.events = np.resize(self.events, (2 * len(self.events), 4))
+        self.events[self.num_events] = (kind, a, b, c)
+        self.num_events += 1
+
+    # Yields (TANGENT, a, b) and (HULL, lo, hi, corners) tuples in the order
+    # they were recorded
+    def __iter__(self):
+        offset = 0
+        for kind, a, b, c in self.events[:self.num_events].tolist():
+            if kind == self.TANGENT:
+                yield kind, a, b
+            else:
+                yield kind, a, b, self.corners[offset:offset + c]
+                offset += c
+
+
+# Raised by a progress callback to stop a solve part way through
+class SolveCancelled(Exception):
+    pass
+
+
+# The divide and conquer reports progress after finishing a merge of at least
+# this many points, so the callback runs a few hundred times on a million points
+# rather than once per merge
+PROGRESS_STEP = 1 << 12
+
+
+#
+# Divide and conquer over one shared, presorted index buffer.  Each recursive
+# call works on a range order[lo:hi] instead of a sliced copy, and the hull of
+# that range (which can't have more than hi - lo corners) is written in place
+# into hulls[lo:lo + size].  hulls and scratch are allocated once per solve, so
+# no lists are built or thrown away as the recursion runs.
+#
+class ArrayHullSolver:
+
+    # If a HullTrace is passed in, every sub-hull and tangent is recorded to it.
+    # progress, if given, is called as progress(done, total) with the number of
+    # points merged so far; it can raise SolveCancelled to abandon the solve.
+    # xs and ys can be numpy float64 arrays or array('d') buffers (and order an
+    # array('l') to go with them), which is how convex_hull_pure runs it.
+    def __init__(self, xs, ys, order, orient=orient_adaptive, trace=None, progress=None):
+        if np is None:
+            order = order if isinstance(order, array) and order.typecode == 'l' else array('l', order)
+        else:
+            order = np.ascontiguousarray(order, dtype=np.intp)
+        self.xs = memoryview(xs)
+        self.ys = memoryview(ys)
+        self.order = memoryview(order)
+        self.orient = orient
+        self.hulls = memoryview(_index_buffer(len(order)))
+        self.scratch = memoryview(_index_buffer(len(order)))
+        self.trace = trace
+        self.progress = progress
+
+    # Solves the whole buffer and returns the hull as an index array into xs/ys
+    def solve(self):
+        size, _ = self.solve_hull(0, len(self.order))
+        return _index_array(self.hulls[:size])
+
+    # Returns the size of the hull of order[lo:hi] and the offset of its
+    # rightmost corner, which the next merge starts its tangent walks from
+    # Function Time Complexity: We will call this recursive function a max of log(n) times because each time the size of n is halved.  Each level then does O(n) work merging, so O(n log n) overall
+    # Function Space Complexity: c per call, on top of the buffers allocated up front
+    def solve_hull(self, lo, hi):
+        num_points = hi - lo
+
+        if num_points <= 3:  # base case
+            size, end = self.solve_base(lo, hi)
+            if self.trace is not None:
+                self.trace.hull(lo, hi, self.hulls[lo:lo + size])
+            return size, end
+
+        mid = lo + num_points // 2
+        left_size, left_end = self.solve_hull(lo, mid)
+        right_size, right_end = self.solve_hull(mid, hi)
+
+        size, end = self.combine_hull(lo, left_size, left_end, mid, right_size, right_end)
+        if self.trace is not None:
+            self.trace.hull(lo, hi, self.hulls[lo:lo + size])
+        if self.progress is not None and num_points >= PROGRESS_STEP:
+            self.progress(hi, len(self.order))
+        return size, end
+
+    # Hull of 3 or fewer points, written straight into the arena
+    # Function Time Complexity: c
+    # Function Space Complexity: c
+    def solve_base(self, lo, hi):
+        hulls, order = self.hulls, self.order
+        if hi - lo == 3:
+            p0, p1, p2 = order[lo], order[lo + 1], order[lo + 2]
+            turn = self.orient(self.xs, self.ys, p0, p1, p2)
+
+            hulls[lo] = p0
+            if turn > 0:  # middle point is below the outer two
+                hulls[lo + 1] = p2
+                hulls[lo + 2] = p1
+                return 3, 1
+            elif turn < 0:  # middle point is above the outer two
+                hulls[lo + 1] = p1
+                hulls[lo + 2] = p2
+                return 3, 2
+            hulls[lo + 1] = p2  # collinear, the middle point isn't a corner
+            return 2, 1
+
+        hulls[lo:hi] = order[lo:hi]  # if 2 or 1 points
+        return hi - lo, hi - lo - 1
+
+    # Merges a row of hulls that are already stored side by side in the arena,
+    # pairing neighbours up level by level the same way the recursion would.
+    # pieces is a list of (start, size, rightmost offset) tuples in sorted order;
+    # the (start, size, rightmost offset) of the final hull is returned.
+    # Function Time Complexity: n log k for k pieces
+    # Function Space Complexity: k
+    def merge_hulls(self, pieces):
+        while len(pieces) > 1:
+            merged = []
+            for k in range(0, len(pieces) - 1, 2):
+                left, left_size, left_end = pieces[k]
+                right, right_size, right_end = pieces[k + 1]
+                size, end = self.combine_hull(left, left_size, left_end, right, right_size, right_end)
+                merged.append((left, size, end))
+            if len(pieces) % 2 == 1:
+                merged.append(pieces[-1])
+            pieces = merged
+        return pieces[0]
+
+    # Merges the hulls stored at hulls[left:left + left_size] and
+    # hulls[right:right + right_size] into one starting at hulls[left].  The
+    # *_end arguments are the offsets of each hull's rightmost corner, as
+    # solve_hull returns them.  Returns the merged size and rightmost offset.
+    # Function Time Complexity: n
+    # Function Space Complexity: c
+    def combine_hull(self, left, left_size, left_end, right, right_size, right_end):
+        hulls, scratch = self.hulls, self.scratch
+
+        left_upper, right_upper = self.find_upper_tangent(left, left_size, left_end, right, right_size, right_end)
+        left_lower, right_lower = self.find_lower_tangent(left, left_size, left_end, right, right_size, right_end)
+
+        # The left hull from its leftmost point around to the upper tangent is
+        # already in place.  The rest (across to the right hull, clockwise down to
+        # the lower tangent, and back along the bottom of the left hull) is
+        # assembled in scratch first, because it overlaps what it's built from.
+        tail = left
+        j = right_upper
+        scratch[tail] = hulls[right + j]
+        tail += 1
+        while j != right_lower:
+            j = (j + 1) % right_size
+            scratch[tail] = hulls[right + j]
+            tail += 1
+
+        if left_lower != 0:  # index 0 is already in
+            count = left_size - left_lower
+            scratch[tail:tail + count] = hulls[left + left_lower:left + left_size]
+            tail += count
+
+        if self.trace is not None:
+            self.trace.tangent(hulls[left + left_upper], hulls[right + right_upper])
+            self.trace.tangent(hulls[left + left_lower], hulls[right + right_lower])
+
+        start = left + left_upper + 1
+        hulls[start:start + tail - left] = scratch[left:tail]
+        size = left_upper + 1 + tail - left
+
+        # The right hull's rightmost corner is on the part copied across, which
+        # starts at its upper tangent point
+        return size, left_upper + 1 + right_end - right_upper
+
+    # Every point of the left hull sorts before every point of the right hull,
+    # so the top of the left hull runs from its index 0 up to its rightmost point
+    # (left_end), and the top of the right hull from its index 0 (its leftmost
+    # point) up to its rightmost point (right_end).  Candidates that are collinear
+    # with the current tangent are taken, so the tangent ends up on the outermost
+    # points and the merged hull has no collinear corners.
+    # Function Time Complexity: n (each index only ever moves one way)
+    # Function Space Complexity: c
+    def find_upper_tangent(self, left, left_size, left_end, right, right_size, right_end):
+        xs, ys, hulls, orient = self.xs, self.ys, self.hulls, self.orient
+        left_hull_index = left_end
+        right_hull_index = 0  # hulls always start at their leftmost point
+
+        moved = True
+        while moved:
+            moved = False
+
+            # Walk counter-clockwise along the top of the left hull while the next
+            # point isn't below the tangent line
+            while left_hull_index != 0:
+                if orient(xs, ys, hulls[left + left_hull_index], hulls[right + right_hull_index],
+                          hulls[left + left_hull_index - 1]) < 0:
+                    break
+                left_hull_index -= 1
+                moved = True
+
+            # Walk clockwise along the top of the right hull
+            while right_hull_index != right_end:
+                if orient(xs, ys, hulls[left + left_hull_index], hulls[right + right_hull_index],
+                          hulls[right + right_hull_index + 1]) < 0:
+                    break
+                right_hull_index += 1
+                moved = True
+
+        return left_hull_index, right_hull_index
+
+    # Function Time and Space Complexity are the same as the upper tan func (see above)
+    def find_lower_tangent(self, left, left_size, left_end, right, right_size, right_end):
+        xs, ys, hulls, orient = self.xs, self.ys, self.hulls, self.orient
+        left_hull_index = left_end
+        right_hull_index = 0
+
+        moved = True
+        while moved:
+            moved = False
+
+            # Walk clockwise along the bottom of the left hull, back towards index
+            # 0, while the next point isn't above the tangent line
+            while left_hull_index != 0:
+                next_index = (left_hull_index + 1) % left_size
+                if orient(xs, ys, hulls[left + left_hull_index], hulls[right + right_hull_index],
+                          hulls[left + next_index]) > 0:
+                    break
+                left_hull_index = next_index
+                moved = True
+
+            # Walk counter-clockwise along the bottom of the right hull
+            while right_hull_index != right_end:
+                next_index = (right_hull_index - 1) % right_size
+                if orient(xs, ys, hulls[left + left_hull_index], hulls[right + right_hull_index],
+                          hulls[right + next_index]) > 0:
+                    break
+                right_hull_index = next_index
+                moved = True
+
+        return left_hull_index, right_hull_index
+
+
+#
+# ArrayHullSolver with counters on the hot path, for finding out why a solve was
+# slow (degenerate inputs push the tangent walks towards O(n) per merge).  It's
+# a separate class so the plain solver pays nothing for them: nothing is
+# counted unless this one is asked for.
+#
+# counters ends up as a dict of
+#   orientations:   orientation tests, in total
+#   upper_steps,
+#   lower_steps:    orientation tests made by the tangent walks
+#   base_cases:     hulls of 3 or fewer points built directly
+#   merges:         combine_hull calls
+#   max_depth:      deepest recursion reached
+#   worst_merge:    (points merged, tangent steps) of the merge with most steps
+#   levels:         per recursion depth, {'depth', 'merges', 'points',
+#                   'corners', 'tangent_steps'}, where points and corners are
+#                   the totals going into and coming out of that depth's merges
+#
+class InstrumentedHullSolver(ArrayHullSolver):
+
+    def __init__(self, xs, ys, order, orient=orient_adaptive, trace=None, progress=None):
+        super().__init__(xs, ys, order, orient, trace, progress)
+        self.num_orientations = 0
+        self.depth = 0
+        self.counters = {'orientations': 0, 'upper_steps': 0, 'lower_steps': 0, 'base_cases': 0, 'merges': 0,
+                         'max_depth': 0, 'worst_merge': (0, 0), 'levels': []}
+        self.levels = {}  # depth -> [merges, points, corners, tangent steps]
+
+        def counted_orient(xs, ys, a, b, c):
+            self.num_orientations += 1
+            return orient(xs, ys, a, b, c)
+        self.orient = counted_orient
+
+    def solve(self):
+        hull = super().solve()
+        self.finish()
+        return hull
+
+    # Copies the running totals into counters; solve() does this itself, other
+    # callers (merge_hulls) should call it when they're done
+    def finish(self):
+        counters = self.counters
+        counters['orientations'] = self.num_orientations
+        counters['levels'] = [{'depth': depth, 'merges': merges, 'points': points, 'corners': corners,
+                               'tangent_steps': steps}
+                              for depth, (merges, points, corners, steps) in sorted(self.levels.items())]
+        return counters
+
+    def solve_hull(self, lo, hi):
+        self.depth += 1
+        if self.depth > self.counters['max_depth']:
+            self.counters['max_depth'] = self.depth
+        try:
+            return super().solve_hull(lo, hi)
+        finally:
+            self.depth -= 1
+
+    def solve_base(self, lo, hi):
+        self.counters['base_cases'] += 1
+        return super().solve_base(lo, hi)
+
+    def combine_hull(self, left, left_size, left_end, right, right_size, right_end):
+        before = self.num_orientations
+        size, end = super().combine_hull(left, left_size, left_end, right, right_size, right_end)
+        steps = self.num_orientations - before
+
+        counters = self.counters
+        counters['merges'] += 1
+        if steps > counters['worst_merge'][1]:
+            counters['worst_merge'] = (left_size + right_size, steps)
+        level = self.levels.setdefault(self.depth, [0, 0, 0, 0])
+        level[0] += 1
+        level[1] += left_size + right_size
+        level[2] += size
+        level[3] += steps
+        return size, end
+
+    def find_upper_tangent(self, left, left_size, left_end, right, right_size, right_end):
+        before = self.num_orientations
+        tangent = super().find_upper_tangent(left, left_size, left_end, right, right_size, right_end)
+        self.counters['upper_steps'] += self.num_orientations - before
+        return tangent
+
+    def find_lower_tangent(self, left, left_size, left_end, right, right_size, right_end):
+        before = self.num_orientations
+        tangent = super().find_lower_tangent(left, left_size, left_end, right, right_size, right_end)
+        self.counters['lower_steps'] += self.num_orientations - before
+        return tangent
+
+
+#
+# Hull engines.  Every engine is called as engine(xs, ys, order, predicate) and
+# returns the same thing: an index array of the hull's corners, clockwise from
+# the lexicographically smallest point.  Engines registered with presorted=True
+# get order from presort(); the others just get every index, in input order.
+#
+ENGINES = {}
+
+
+# Decorator that adds an engine to the registry under `name`
+def register_engine(name, presorted=True):
+    def register(engine):
+        ENGINES[name] = (engine, presorted)
+        return engine
+    return register
+
+
+# Looks up a registered engine by name, returning (engine, presorted)
+def get_engine(name):
+    try:
+        return ENGINES[name]
+    except KeyError:
+        raise ValueError('Unknown hull engine {!r}, expected one of {}'.format(
+            name, ', '.join(sorted(ENGINES) + ['auto']))) from None
+
+
+# Runs the divide and conquer over points that have already been put in order
+# by presort(), returning the hull as an index array into xs/ys.  predicate is
+# the name of one of the ORIENTATION_PREDICATES; trace is an optional HullTrace
+# and progress an optional callback (see ArrayHullSolver).  Passing a dict as
+# counters runs the InstrumentedHullSolver and fills the dict with its counters.
+@register_engine('dc')
+def solve_sorted(xs, ys, order, predicate='adaptive', trace=None, progress=None, counters=None):
+    orient = get_orientation_predicate(predicate)
+    if len(order) == 0:
+        return _index_array([])
+
+    if counters is None:
+        return ArrayHullSolver(xs, ys, order, orient, trace, progress).solve()
+
+    solver = InstrumentedHullSolver(xs, ys, order, orient, trace, progress)
+    hull = solver.solve()
+    counters.update(solver.counters)
+    return hull
+
+
+# Andrew's monotone chain over presorted points.  Returns the top of the hull
+# from the leftmost point to the rightmost point, and the bottom from the
+# rightmost point back to the leftmost, both clockwise and including both ends.
+# Function Time Complexity: n (after the sort)
+# Function Space Complexity: n
+def monotone_chains(xs, ys, order, orient):
+    upper = []
+    for point in order:
+        while len(upper) >= 2 and orient(xs, ys, upper[-2], upper[-1], point) >= 0:
+            upper.pop()
+        upper.append(point)
+
+    lower = []
+    for k in range(len(order) - 1, -1, -1):
+        point = order[k]
+        while len(lower) >= 2 and orient(xs, ys, lower[-2], lower[-1], point) >= 0:
+            lower.pop()
+        lower.append(point)
+
+    return upper, lower
+
+
+@register_engine('monotone')
+def monotone_chain(xs, ys, order, predicate='adaptive'):
+    orient = get_orientation_predicate(predicate)
+    if len(order) == 0:
+        return np.empty(0, dtype=np.intp)
+
+    upper, lower = monotone_chains(memoryview(xs), memoryview(ys), np.asarray(order).tolist(), orient)
+    return np.array(upper + lower[1:-1], dtype=np.intp)
+
+
+# Vectorized orientation of many (a, b, c) triples, given as coordinate arrays
+# (or scalars) that broadcast together.  With anything but the 'fast'
+# predicate, entries too close to 0 to trust are redone one at a time with the
+# scalar predicate, which may only give their sign: use the result's signs, not
+# its sizes.
+# Function Time Complexity: n, vectorized (plus the entries redone)
+# Function Space Complexity: n
+def orient_many(ax, ay, bx, by, cx, cy, predicate='adaptive'):
+    det, error = _orient_terms(ax, ay, bx, by, cx, cy)
+    if predicate == 'fast':
+        return det
+
+    unsure = np.flatnonzero(np.abs(det) <= error)
+    if len(unsure):
+        orient = get_orientation_predicate(predicate)
+        ax, ay, bx, by, cx, cy = (np.broadcast_to(value, det.shape) for value in (ax, ay, bx, by, cx, cy))
+        for k in unsure.tolist():
+            det[k] = orient((float(ax[k]), float(bx[k]), float(cx[k])), (float(ay[k]), float(by[k]), float(cy[k])),
+                            0, 1, 2)
+    return det
+
+
+# The floating point cross products and a bound on each one's rounding error
+def _orient_terms(ax, ay, bx, by, cx, cy):
+    det_left = np.multiply(np.subtract(bx, ax), np.subtract(cy, ay))
+    det_right = np.multiply(np.subtract(by, ay), np.subtract(cx, ax))
+    det = np.array(det_left - det_right, dtype=np.float64, ndmin=1)
+    return det, _ORIENT_ERROR_BOUND * (np.abs(det_left) + np.abs(det_right))
+
+
+# orient_many of every candidate against the line from point a to point b
+def _orient_candidates(xs, ys, a, b, candidates, predicate):
+    return orient_many(xs[a], ys[a], xs[b], ys[b], xs[candidates], ys[candidates], predicate)
+
+
+# Lexicographically smallest and largest of the candidates, without sorting
+def _extreme_points(xs, ys, candidates):
+    cand_xs = xs[candidates]
+    at_min = candidates[cand_xs == cand_xs.min()]
+    at_max = candidates[cand_xs == cand_xs.max()]
+    return int(at_min[np.argmin(ys[at_min])]), int(at_max[np.argmax(ys[at_max])])
+
+
+# Appends the corners strictly between a and b to hull, for candidates that are
+# all strictly left of a -> b.  Uses a stack rather than recursion, since the
+# depth can be as large as the hull.
+def _quickhull_chain(xs, ys, a, b, candidates, predicate, hull):
+    stack = [(a, b, candidates)]
+    while stack:
+        a, b, candidates = stack.pop()
+        if candidates is None:  # a corner queued up between two sub-chains
+            hull.append(a)
+            continue
+        if len(candidates) == 0:
+            continue
+
+        # The farthest candidate from a -> b is a corner.  If several are equally
+        # far they lie along a line parallel to a -> b, and only the ends of that
+        # run are corners, so take the lexicographically smallest.  Unless the
+        # predicate is 'fast', every candidate that could be the farthest given
+        # the rounding error is measured exactly to settle it.
+        det, error = _orient_terms(xs[a], ys[a], xs[b], ys[b], xs[candidates], ys[candidates])
+        if predicate == 'fast':
+            far = candidates[det >= det.max()]
+        else:
+            far = candidates[det + error >= (det - error).max()]
+        if len(far) > 1:
+            far = far[np.lexsort((ys[far], xs[far]))]
+            if predicate != 'fast':
+                exact = [_exact_det(xs, ys, a, b, c) for c in far.tolist()]
+                far = far[[exact.index(max(exact))]]
+        c = int(far[0])
+
+        outside_left = candidates[_orient_candidates(xs, ys, a, c, candidates, predicate) > 0]
+        outside_right = candidates[_orient_candidates(xs, ys, c, b, candidates, predicate) > 0]
+        stack.append((c, b, outside_right))
+        stack.append((c, None, None))
+        stack.append((a, c, outside_left))
+
+
+# QuickHull, with each partition step done over numpy arrays.  Expected
+# O(n log h), so it wins when most points are inside the hull.
+@register_engine('quickhull', presorted=False)
+def quickhull(xs, ys, order, predicate='adaptive'):
+    candidates = np.asarray(order, dtype=np.intp)
+    if len(candidates) == 0:
+        return np.empty(0, dtype=np.intp)
+
+    leftmost, rightmost = _extreme_points(xs, ys, candidates)
+    if leftmost == rightmost:
+        return np.array([leftmost], dtype=np.intp)
+
+    det = _orient_candidates(xs, ys, leftmost, rightmost, candidates, predicate)
+    hull = [leftmost]
+    _quickhull_chain(xs, ys, leftmost, rightmost, candidates[det > 0], predicate, hull)
+    hull.append(rightmost)
+    _quickhull_chain(xs, ys, rightmost, leftmost, candidates[det < 0], predicate, hull)
+    return np.array(hull, dtype=np.intp)
+
+
+# Andrew's monotone chain over every row of a padded matrix of point indices at
+# once; valid marks the real entries.  One lexsort sorts every row (the padding
+# after the real points), and then the stack walk runs on all the rows in
+# lockstep: each step pushes the next column onto every row's stack, popping
+# (with numpy, across all the rows that need it) first, so the number of numpy
+# calls grows with the width of the matrix rather than its height.  Returns
+# (upper, upper_sizes, lower, lower_sizes): each row's chains as in
+# monotone_chains, left-aligned in matrices of point indices, and their lengths.
+# Function Time Complexity: n log (width), vectorized over the rows
+# Function Space Complexity: n
+def monotone_chain_rows(xs, ys, points, valid, predicate='adaptive'):
+    rows = np.lexsort((ys[points], xs[points], ~valid), axis=1)
+    points = np.take_along_axis(points, rows, axis=1)
+    columns = np.arange(points.shape[1], dtype=np.intp)
+    valid = columns < np.count_nonzero(valid, axis=1)[:, None]
+
+    # Exact duplicates are next to each other now; only the first of each counts
+    row_xs, row_ys = xs[points], ys[points]
+    valid[:, 1:] &= (row_xs[:, 1:] != row_xs[:, :-1]) | (row_ys[:, 1:] != row_ys[:, :-1])
+
+    # The walks work on the sorted coordinates, flattened, by position in them
+    row_xs, row_ys = row_xs.ravel(), row_ys.ravel()
+    upper, upper_sizes = _lockstep_chain(row_xs, row_ys, valid, columns.tolist(), predicate)
+    lower, lower_sizes = _lockstep_chain(row_xs, row_ys, valid, columns[::-1].tolist(), predicate)
+    return points.ravel()[upper], upper_sizes, points.ravel()[lower], lower_sizes
+
+
+# The monotone chain stack walk over every row of a padded matrix at once,
+# visiting the columns in the given order.  xs and ys are the matrix's
+# coordinates flattened.  Returns each row's stack, left-aligned, as positions
+# in the flattened matrix, and its height.
+def _lockstep_chain(xs, ys, valid, columns, predicate):
+    num_rows, width = valid.shape
+    row_starts = np.arange(0, num_rows * width, width, dtype=np.intp)
+    stack = np.zeros(num_rows * width, dtype=np.intp)
+    heights = np.zeros(num_rows, dtype=np.intp)
+
+    for column in columns:
+        active = np.flatnonzero(valid[:, column])
+
+        # Pop from the rows whose top two points and the new one don't make a
+        # strict right turn, until there are none left
+        popping = active[heights[active] >= 2]
+        while len(popping):
+            tops = row_starts[popping] + heights[popping]
+            a, b, c = stack[tops - 2], stack[tops - 1], row_starts[popping] + column
+            det = orient_many(xs[a], ys[a], xs[b], ys[b], xs[c], ys[c], predicate)
+            popping = popping[det >= 0]
+            heights[popping] -= 1
+            popping = popping[heights[popping] >= 2]
+
+        stack[row_starts[active] + heights[active]] = row_starts[active] + column
+        heights[active] += 1
+    return stack.reshape(num_rows, width), heights
+
+
+# Lexicographic comparison of points a and b (indices or index arrays), or its
+# reverse.  Reversing the order is the same as turning the plane by 180
+# degrees, which swaps the top and bottom of every hull and leaves orientations
+# unchanged.
+def _lex_less(xs, ys, a, b, reverse):
+    if reverse:
+        a, b = b, a
+    return (xs[a] < xs[b]) | ((xs[a] == xs[b]) & (ys[a] < ys[b]))
+
+
+# Gift wraps one side of the hull across the groups' chains (a matrix, one
+# chain per row, with their lengths), from `start` to `end` (the top with
+# reverse=False, the bottom with reverse=True).  Each step finds every group's
+# candidate with binary searches run on all the groups in lockstep, then picks
+# the next corner among the candidates by halving rounds of orientation tests,
+# so a step costs O(log m + log groups) numpy calls.  Gives up and returns None
+# after `limit` corners.
+def _chan_wrap(xs, ys, chains, sizes, start, end, predicate, reverse, limit):
+    wrapped = [start]
+    p = start
+    while p != end:
+        if len(wrapped) > limit:
+            return None
+
+        # Skip the part of each chain that isn't past p
+        lo, hi = np.zeros(len(chains), dtype=np.intp), sizes.copy()
+        searching = np.flatnonzero(lo < hi)
+        while len(searching):
+            mid = (lo[searching] + hi[searching]) // 2
+            past = _lex_less(xs, ys, p, chains[searching, mid], reverse)
+            hi[searching[past]] = mid[past]
+            lo[searching[~past]] = mid[~past] + 1
+            searching = searching[lo[searching] < hi[searching]]
+        groups = np.flatnonzero(lo < sizes)
+
+        # Along the rest of each chain, the next point stays on or left of the
+        # line from p through the current one up to the tangent, and is
+        # strictly right of it after
+        lo, hi = lo[groups], sizes[groups] - 1
+        searching = np.flatnonzero(lo < hi)
+        while len(searching):
+            mid = (lo[searching] + hi[searching]) // 2
+            a, b = chains[groups[searching], mid], chains[groups[searching], mid + 1]
+            ahead = orient_many(xs[p], ys[p], xs[a], ys[a], xs[b], ys[b], predicate) >= 0
+            lo[searching[ahead]] = mid[ahead] + 1
+            hi[searching[~ahead]] = mid[~ahead]
+            searching = searching[lo[searching] < hi[searching]]
+        candidates = chains[groups, lo]
+
+        # The candidates are all past p, so within a half-plane around it, and
+        # "further clockwise, or as far and further along" orders them; keep
+        # the winner of each neighbouring pair until one is left.  Pairing
+        # neighbours keeps the groups' order, so of duplicates the first wins.
+        while len(candidates) > 1:
+            paired = len(candidates) // 2 * 2
+            a, b = candidates[0:paired:2], candidates[1:paired:2]
+            turn = orient_many(xs[p], ys[p], xs[a], ys[a], xs[b], ys[b], predicate)
+            later = (turn > 0) | ((turn == 0) & _lex_less(xs, ys, a, b, reverse))
+            candidates = np.concatenate((np.where(later, b, a), candidates[paired:]))
+
+        p = int(candidates[0])
+        wrapped.append(p)
+    return wrapped
+
+
+# Group size Chan's algorithm starts with, and the largest it grows to.  Every
+# round builds all the groups' chains with one lockstep walk, a few numpy calls
+# per column, and each wrap step works on all the groups at once.  Smaller
+# groups would only repeat that work over more rounds, and much wider ones make
+# the walk's per-column steps cost more than the monotone chain's Python loop
+# over the points that are left.
+CHAN_GROUP_SIZE = 256
+CHAN_WIDTH_LIMIT = 4096
+
+
+# Chan's algorithm: hulls of groups of m points, gift wrapped together, with m
+# squared each time the hull turns out to have more than m corners.  Every
+# corner of the hull is a corner of its group's hull, so only the points on the
+# groups' chains go on to the next round.  Once m would pass CHAN_WIDTH_LIMIT,
+# or cover all the points left, the monotone chain finishes over them.
+# Function Time Complexity: n log h
+# Function Space Complexity: n
+@register_engine('chan', presorted=False)
+def chan(xs, ys, order, predicate='adaptive'):
+    candidates = np.asarray(order, dtype=np.intp)
+    if len(candidates) == 0:
+        return np.empty(0, dtype=np.intp)
+
+    leftmost, rightmost = _extreme_points(xs, ys, candidates)
+    m = CHAN_GROUP_SIZE
+    while m < len(candidates) and m <= CHAN_WIDTH_LIMIT:
+        num_groups = -(-len(candidates) // m)
+        points = np.zeros(num_groups * m, dtype=np.intp)
+        points[:len(candidates)] = candidates
+        valid = np.arange(num_groups * m) < len(candidates)
+        upper, upper_sizes, lower, lower_sizes = monotone_chain_rows(
+            xs, ys, points.reshape(num_groups, m), valid.reshape(num_groups, m), predicate)
+
+        top = _chan_wrap(xs, ys, upper, upper_sizes, leftmost, rightmost, predicate, False, m)
+        if top is not None:
+            bottom = _chan_wrap(xs, ys, lower, lower_sizes, rightmost, leftmost, predicate, True, m - len(top) + 2)
+            if bottom is not None:
+                return np.array(top + bottom[1:-1], dtype=np.intp)
+
+        columns = np.arange(m, dtype=np.intp)
+        candidates = np.unique(np.concatenate((upper[columns < upper_sizes[:, None]],
+                                               lower[columns < lower_sizes[:, None]])))
+        m *= m
+
+    return monotone_chain(xs, ys, candidates[presort(xs[candidates], ys[candidates])], predicate)
+
+
+# Akl-Toussaint prefilter.  The points that are extreme in x, y, x + y and
+# x - y make an octagon (fewer corners if some coincide) that is inside the hull,
+# so any point strictly inside it can't be a corner and is thrown away before
+# the sort.  A point is only dropped when the floating point test is sure of it.
+# Returns the indices of the points that survive, in input order.
+# Function Time Complexity: n, all of it vectorized
+# Function Space Complexity: n
+def cull_interior(xs, ys):
+    num_points = len(xs)
+    if num_points < 9:
+        return np.arange(num_points, dtype=np.intp)
+
+    sums = xs + ys
+    differences = xs - ys
+    corners = [int(np.argmin(xs)), int(np.argmin(sums)), int(np.argmin(ys)), int(np.argmax(differences)),
+               int(np.argmax(xs)), int(np.argmax(sums)), int(np.argmax(ys)), int(np.argmin(differences))]
+    del sums, differences
+
+    # The corners are in counter-clockwise order; drop repeated ones
+    octagon = []
+    for corner in corners:
+        if not octagon or (xs[corner], ys[corner]) != (xs[octagon[-1]], ys[octagon[-1]]):
+            octagon.append(corner)
+    if len(octagon) > 1 and (xs[octagon[0]], ys[octagon[0]]) == (xs[octagon[-1]], ys[octagon[-1]]):
+        octagon.pop()
+    if len(octagon) < 3:
+        return np.arange(num_points, dtype=np.intp)
+
+    inside = np.ones(num_points, dtype=bool)
+    for k in range(len(octagon)):
+        a, b = octagon[k], octagon[(k + 1) % len(octagon)]
+        det_left = (xs[b] - xs[a]) * (ys - ys[a])
+        det_right = (ys[b] - ys[a]) * (xs - xs[a])
+        inside &= det_left - det_right > _ORIENT_ERROR_BOUND * (np.abs(det_left) + np.abs(det_right))
+    return np.flatnonzero(~inside)
+
+
+# Size of the sample the auto policy looks at, and the share of the sample on
+# its hull below which an output-sensitive engine is used
+AUTO_SAMPLE_SIZE = 1024
+AUTO_HULL_FRACTION = 0.05
+
+
+# The 'auto' policy.  Small inputs go to the monotone chain, which has the least
+# overhead.  Otherwise the hull of an evenly spaced sample estimates how much of
+# the input is on the hull: if very little is, QuickHull (which throws interior
+# points away in bulk) is used, and if a lot is, the monotone chain.
+def choose_engine(xs, ys):
+    num_points = len(xs)
+    if num_points <= AUTO_SAMPLE_SIZE:
+        return 'monotone'
+
+    sample = np.arange(0, num_points, num_points // AUTO_SAMPLE_SIZE)
+    sample_hull = monotone_chain(xs, ys, sample[presort(xs[sample], ys[sample])], 'fast')
+    if len(sample_hull) < AUTO_HULL_FRACTION * len(sample):
+        return 'quickhull'
+    return 'monotone'
+
+
+# Picks the engine (a registered name, 'auto', or an engine function that takes
+# presorted points), sorts if the engine needs it, and solves.  With prefilter
+# on, cull_interior() runs first and only its survivors are sorted and solved.
+# If a stats dict is passed in, the engine used, the number of points culled,
+# and the seconds spent in the prefilter, the sort and the engine are recorded
+# under 'engine', 'culled', 'prefilter', 'sort' and 'hull'.
+def solve_with_engine(xs, ys, engine='auto', predicate='adaptive', prefilter=False, stats=None):
+    t1 = time.time()
+    candidates = cull_interior(xs, ys) if prefilter else None
+    t2 = time.time()
+
+    if callable(engine):
+        function, presorted = engine, True
+    else:
+        if engine == 'auto':
+            engine = choose_engine(xs, ys) if candidates is None else choose_engine(xs[candidates], ys[candidates])
+        function, presorted = get_engine(engine)
+
+    if candidates is None:
+        order = presort(xs, ys) if presorted else np.arange(len(xs), dtype=np.intp)
+    else:
+        order = candidates[presort(xs[candidates], ys[candidates])] if presorted else candidates
+    t3 = time.time()
+    hull = function(xs, ys, order, predicate)
+    t4 = time.time()
+
+    if stats is not None:
+        stats['engine'] = engine if not callable(engine) else _engine_name(engine)
+        stats['culled'] = 0 if candidates is None else len(xs) - len(candidates)
+        stats['prefilter'] = t2 - t1
+        stats['sort'] = t3 - t2
+        stats['hull'] = t4 - t3
+    return hull
+
+
+# Name of an engine passed in as a callable: its registry name if it's one of
+# the ENGINES (possibly wrapped in functools.partial), else its function name
+def _engine_name(engine):
+    function = getattr(engine, 'func', engine)
+    for name, (registered, _) in ENGINES.items():
+        if registered is function:
+            return name
+    return getattr(function, '__name__', repr(function))
+
+
+# Headless entry point: takes an (N, 2) float64 array (or x and y buffers) and
+# returns the hull as an array of indices into the input, clockwise from the
+# leftmost point.  Repeated x values, duplicate points and collinear runs are
+# all fine; only the corners of the hull are returned.  engine is one of the
+# registered ENGINES or 'auto'; see solve_with_engine for prefilter and stats.
+def compute_hull_indices(points, ys=None, engine='auto', predicate='adaptive', prefilter=False, stats=None):
+    xs, ys = as_coordinate_arrays(points, ys)
+    return solve_with_engine(xs, ys, engine, predicate, prefilter, stats)
@@ -0,0 +1,325 @@
+import numpy as np
+
+from convex_hull_core import get_orientation_predicate
+
+#
+# Fully dynamic hull, in the style of Overmars and van Leeuwen.  The points sit
+# in the leaves of a balanced tree, in (x, y) order.  Every internal node keeps
+# the bridges (the upper and lower tangents) between the hulls of its two
+# children, which describes its own hull without storing it: the upper chain of
+# a node is its left child's upper chain up to the bridge, then its right
+# child's upper chain from the bridge on.  Inserting or deleting a point only
+# recomputes the bridges on one root-to-leaf path.
+#
+# Bridges are found by binary search over the children's implicit chains, and
+# reading a chain vertex walks down the tree, so an update costs O(log^4 n) in
+# the worst case and much less when the subtree hulls are small.  Queries read
+# the root's chains: containment is O(log^2 n), and listing the hull O(h log n).
+#
+
+# A subtree is rebuilt when one child holds more than this share of its points
+BALANCE = 0.7
+
+
+class _Node:
+    __slots__ = ('left', 'right', 'point', 'split', 'size',
+                 'upper_size', 'upper_left', 'upper_right',
+                 'lower_size', 'lower_left', 'lower_right')
+
+    def __init__(self, point=None, left=None, right=None, split=None):
+        self.point = point  # index of the point, for leaves
+        self.left = left
+        self.right = right
+        self.split = split  # (x, y) of the largest point on the left, for routing
+        self.size = 1
+        self.upper_size = self.lower_size = 1
+        self.upper_left = self.upper_right = self.lower_left = self.lower_right = 0
+
+
+class DynamicHull:
+
+    def __init__(self, points=None, predicate='adaptive'):
+        self.orient = get_orientation_predicate(predicate)
+        self.xs = []
+        self.ys = []
+        self.free = []  # point indices that can be reused
+        self.counts = {}  # (x, y) -> how many times it has been inserted
+        self.root = None
+
+        if points is not None:
+            self.insert_many(points)
+
+    def __len__(self):
+        return sum(self.counts.values())
+
+    # Adds a point.  Inserting a point that is already there just counts it
+    # again, so it takes as many deletes to remove.
+    # Function Time Complexity: log^4 n worst case, amortized over rebuilds
+    # Function Space Complexity: log n
+    def insert(self, x, y):
+        key = (float(x), float(y))
+        if key in self.counts:
+            self.counts[key] += 1
+            return
+        self.counts[key] = 1
+
+        leaf = _Node(point=self._new_point(*key))
+        if self.root is None:
+            self.root = leaf
+            return
+
+        path = []
+        node = self.root
+        while node.point is None:
+            path.append(node)
+            node = node.left if key <= node.split else node.right
+
+        node_key = (self.xs[node.point], self.ys[node.point])
+        if key < node_key:
+            joined = _Node(left=leaf, right=node, split=key)
+        else:
+            joined = _Node(left=node, right=leaf, split=node_key)
+        self._replace(path[-1] if path else None, node, joined)
+
+        path.append(joined)
+        self._update_path(path)
+
+    # Removes a point (one copy of it, if it was inserted more than once).
+    # Raises KeyError if it isn't there.
+    # Function Time Complexity: log^4 n worst case, amortized over rebuilds
+    # Function Space Complexity: log n
+    def delete(self, x, y):
+        key = (float(x), float(y))
+        count = self.counts[key]
+        if count > 1:
+            self.counts[key] = count - 1
+            return
+        del self.counts[key]
+
+        path = []
+        node = self.root
+        while node.point is None:
+            path.append(node)
+            node = node.left if key <= node.split else node.right
+        self.free.append(node.point)
+
+        if not path:
+            self.root = None
+            return
+        parent = path.pop()
+        sibling = parent.right if parent.left is node else parent.left
+        self._replace(path[-1] if path else None, parent, sibling)
+        self._update_path(path)
+
+    # Adds a batch of points.  Into an empty hull they are sorted and the tree
+    # built bottom up in one go, which is much cheaper than inserting them one
+    # at a time.
+    def insert_many(self, points):
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 2).tolist()
+        if self.root is not None:
+            for x, y in points:
+                self.insert(x, y)
+            return
+
+        for x, y in points:
+            key = (x, y)
+            self.counts[key] = self.counts.get(key, 0) + 1
+        if self.counts:
+            leaves = [_Node(point=self._new_point(x, y)) for x, y in sorted(self.counts)]
+            self.root = self._build(leaves, 0, len(leaves))
+
+    def delete_many(self, points):
+        for x, y in np.asarray(points, dtype=np.float64).reshape(-1, 2).tolist():
+            self.delete(x, y)
+
+    # The corners of the hull as an (h, 2) array, clockwise from the leftmost one
+    # Function Time Complexity: h log n
+    # Function Space Complexity: h
+    def hull(self):
+        if self.root is None:
+            return np.empty((0, 2), dtype=np.float64)
+
+        upper = self._chain(self.root, True)
+        lower = self._chain(self.root, False)
+        corners = upper + lower[-2:0:-1]
+        return np.array([(self.xs[p], self.ys[p]) for p in corners], dtype=np.float64).reshape(-1, 2)
+
+    # Whether (x, y) is inside the hull or on its boundary
+    # Function Time Complexity: log^2 n
+    # Function Space Complexity: c
+    def contains(self, x, y):
+        if self.root is None:
+            return False
+        x, y = float(x), float(y)
+
+        # The query point goes in a scratch slot so the predicates can use it
+        query = self._new_point(x, y)
+        try:
+            return self._below_chain(query, True) and self._below_chain(query, False)
+        finally:
+            self.free.append(query)
+
+    # Whether the query point is on or below the upper chain (upper=True), or
+    # on or above the lower chain (upper=False)
+    def _below_chain(self, query, upper):
+        xs, ys, root = self.xs, self.ys, self.root
+        sign = 1 if upper else -1
+        size = root.upper_size if upper else root.lower_size
+        x, y = xs[query], ys[query]
+
+        first = self._vertex(root, 0, upper)
+        last = self._vertex(root, size - 1, upper)
+        if x < xs[first] or x > xs[last]:
+            return False
+
+        # Only the first and last edge of a chain can be vertical; leave them
+        # out so the edge found below spans x properly
+        lo, hi = 0, size - 2
+        if size >= 2 and xs[self._vertex(root, 1, upper)] == xs[first]:
+            lo = 1
+        if size >= 2 and xs[self._vertex(root, size - 2, upper)] == xs[last]:
+            hi = size - 3
+        if lo > hi:  # the whole hull is one vertical segment (or a point)
+            low, high = sorted((ys[first], ys[last]))
+            return x == xs[first] and low <= y <= high
+
+        # Last edge whose left end is at or before x
+        while lo < hi:
+            mid = (lo + hi + 1) // 2
+            if xs[self._vertex(root, mid, upper)] <= x:
+                lo = mid
+            else:
+                hi = mid - 1
+        a, b = self._vertex(root, lo, upper), self._vertex(root, lo + 1, upper)
+        return sign * self.orient(xs, ys, a, b, query) <= 0
+
+    def _new_point(self, x, y):
+        if self.free:
+            point = self.free.pop()
+            self.xs[point] = x
+            self.ys[point] = y
+        else:
+            point = len(self.xs)
+            self.xs.append(x)
+            self.ys.append(y)
+        return point
+
+    def _replace(self, parent, old, new):
+        if parent is None:
+            self.root = new
+        elif parent.left is old:
+            parent.left = new
+        else:
+            parent.right = new
+
+    # Recomputes the nodes on a root-to-node path, bottom up, then rebuilds the
+    # highest one that has got out of balance
+    def _update_path(self, path):
+        for node in reversed(path):
+            self._update(node)
+
+        for k, node in enumerate(path):
+            if max(node.left.size, node.right.size) > BALANCE * node.size + 1:
+                self._replace(path[k - 1] if k > 0 else None, node, self._rebuild(node))
+                break
+
+    def _rebuild(self, node):
+        leaves = []
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            if node.point is not None:
+                leaves.append(node)
+            else:
+                stack.append(node.right)
+                stack.append(node.left)
+        return self._build(leaves, 0, len(leaves))
+
+    def _build(self, leaves, lo, hi):
+        if hi - lo == 1:
+            return leaves[lo]
+        mid = (lo + hi) // 2
+        split = leaves[mid - 1].point
+        node = _Node(left=self._build(leaves, lo, mid), right=self._build(leaves, mid, hi),
+                     split=(self.xs[split], self.ys[split]))
+        self._update(node)
+        return node
+
+    def _update(self, node):
+        left, right = node.left, node.right
+        node.size = left.size + right.size
+        node.upper_left, node.upper_right = self._bridge(left, right, True)
+        node.upper_size = node.upper_left + 1 + right.upper_size - node.upper_right
+        node.lower_left, node.lower_right = self._bridge(left, right, False)
+        node.lower_size = node.lower_left + 1 + right.lower_size - node.lower_right
+
+    # Vertex k of a node's upper or lower chain (both run left to right)
+    # Function Time Complexity: height of the node
+    @staticmethod
+    def _vertex(node, k, upper):
+        while node.point is None:
+            if upper:
+                left_end, right_start = node.upper_left, node.upper_right
+            else:
+                left_end, right_start = node.lower_left, node.lower_right
+            if k <= left_end:
+                node = node.left
+            else:
+                k += right_start - left_end - 1
+                node = node.right
+        return node.point
+
+    # All the vertices of a node's upper or lower chain, left to right
+    def _chain(self, node, upper):
+        chain = []
+        stack = [(node, 0, (node.upper_size if upper else node.lower_size) - 1)]
+        while stack:
+            node, lo, hi = stack.pop()
+            if node.point is not None:
+                chain.append(node.point)
+                continue
+            if upper:
+                left_end, right_start = node.upper_left, node.upper_right
+            else:
+                left_end, right_start = node.lower_left, node.lower_right
+            if hi > left_end:
+                stack.append((node.right, max(lo, left_end + 1) + right_start - left_end - 1,
+                              hi + right_start - left_end - 1))
+            if lo <= left_end:
+                stack.append((node.left, lo, min(hi, left_end)))
+        return chain
+
+    # Point of the right child's chain that the tangent from point p touches.
+    # Every point of the right child sorts after p, so along the chain the next
+    # vertex stays on the outer side of the line from p through the current one
+    # (or on it) until the tangent, and is strictly inside after.
+    def _tangent(self, p, node, upper):
+        xs, ys, orient = self.xs, self.ys, self.orient
+        sign = 1 if upper else -1
+        lo, hi = 0, (node.upper_size if upper else node.lower_size) - 1
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if sign * orient(xs, ys, p, self._vertex(node, mid, upper), self._vertex(node, mid + 1, upper)) >= 0:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    # The bridge between the chains of two neighbouring subtrees, as a vertex
+    # index into each.  Walking the left chain to the right, the next vertex is
+    # strictly outside the tangent line from the current one until the bridge
+    # is reached.  Collinear points go to the outermost ends, like the solver.
+    # Function Time Complexity: log^2 h chain vertices read
+    def _bridge(self, left, right, upper):
+        xs, ys, orient = self.xs, self.ys, self.orient
+        sign = 1 if upper else -1
+        lo, hi = 0, (left.upper_size if upper else left.lower_size) - 1
+        while lo < hi:
+            mid = (lo + hi) // 2
+            a = self._vertex(left, mid, upper)
+            b = self._vertex(right, self._tangent(a, right, upper), upper)
+            if sign * orient(xs, ys, a, b, self._vertex(left, mid + 1, upper)) > 0:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo, self._tangent(self._vertex(left, lo, upper), right, upper)
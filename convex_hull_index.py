@@ -0,0 +1,229 @@
+import math
+from bisect import bisect_right
+
+import numpy as np
+
+from convex_hull_core import as_coordinate_arrays, get_orientation_predicate, orient_many, solve_with_engine
+
+#
+# Queries against a hull once it has been found.  A hull in the solver's order
+# (clockwise from its lexicographically smallest corner) splits into two chains
+# that are monotone in x: the upper chain, from the leftmost corner clockwise to
+# the rightmost, and the lower chain, from the leftmost corner counter-clockwise
+# to the rightmost.  Binary searches along them answer
+#   containment:  find the edge above and the edge below the probe's x
+#   extremes:     the support value is unimodal along each chain
+# in O(log h), and the bulk variants do the same searches for many probes at
+# once with numpy.  Diameter and width come from rotating calipers, in O(h).
+#
+
+
+class HullIndex:
+
+    # xs and ys are the coordinate buffers the hull was found in, and hull the
+    # solver's output (indices into them).  Only the h corners are copied, so the
+    # buffers can be freed afterwards.  predicate is used for the orientation
+    # tests that decide containment, as in the solver.
+    def __init__(self, xs, ys, hull, predicate='adaptive'):
+        self.hull = np.array(hull, dtype=np.intp)
+        self.predicate = predicate
+        self.orient = get_orientation_predicate(predicate)
+        self.hull_xs = np.ascontiguousarray(np.asarray(xs, dtype=np.float64)[self.hull])
+        self.hull_ys = np.ascontiguousarray(np.asarray(ys, dtype=np.float64)[self.hull])
+        self.area = 0.5 * abs(float(np.dot(self.hull_xs, np.roll(self.hull_ys, -1)) -
+                                    np.dot(np.roll(self.hull_xs, -1), self.hull_ys)))
+
+        num_corners = len(self.hull)
+        if num_corners < 3:
+            return
+
+        # The rightmost corner ends the upper chain.  A vertical edge at either
+        # end is left out of the chains, so both are strictly increasing in x;
+        # the corners at its ends are still in one chain or the other.
+        right = int(np.lexsort((self.hull_ys, self.hull_xs))[-1])
+        upper = list(range(0, right + 1))
+        lower = [0] + list(range(num_corners - 1, right - 1, -1))
+        if self.hull_xs[1] == self.hull_xs[0]:
+            upper.pop(0)
+        if right + 1 < num_corners and self.hull_xs[right + 1] == self.hull_xs[right]:
+            lower.pop()
+
+        self.upper = np.array(upper, dtype=np.intp)
+        self.lower = np.array(lower, dtype=np.intp)
+        self.upper_xs, self.upper_ys = self.hull_xs[self.upper], self.hull_ys[self.upper]
+        self.lower_xs, self.lower_ys = self.hull_xs[self.lower], self.hull_ys[self.lower]
+        self.min_x, self.max_x = float(self.hull_xs[0]), float(self.hull_xs[right])
+
+        # Plain float lists for the one-probe queries, which are quicker to
+        # index from Python than numpy arrays
+        self.upper_chain = (self.upper_xs.tolist(), self.upper_ys.tolist())
+        self.lower_chain = (self.lower_xs.tolist(), self.lower_ys.tolist())
+
+    def __len__(self):
+        return len(self.hull)
+
+    # Whether (x, y) is inside the hull or on its boundary
+    # Function Time Complexity: log h
+    # Function Space Complexity: c
+    def contains(self, x, y):
+        if len(self.hull) < 3:
+            probe_xs, probe_ys = np.array([x], dtype=np.float64), np.array([y], dtype=np.float64)
+            return bool(self._contains_degenerate(probe_xs, probe_ys)[0])
+        if not self.min_x <= x <= self.max_x:
+            return False
+        return self._chain_side(self.upper_chain, x, y) <= 0 and self._chain_side(self.lower_chain, x, y) >= 0
+
+    # contains() for an (M, 2) array of probes (or x and y buffers), as a bool array
+    # Function Time Complexity: M log h, vectorized
+    # Function Space Complexity: M
+    def contains_many(self, points, ys=None):
+        probe_xs, probe_ys = as_coordinate_arrays(points, ys)
+        if len(self.hull) < 3:
+            return self._contains_degenerate(probe_xs, probe_ys)
+
+        inside = (probe_xs >= self.min_x) & (probe_xs <= self.max_x)
+        inside &= self._chain_sides(self.upper_xs, self.upper_ys, probe_xs, probe_ys) <= 0
+        inside &= self._chain_sides(self.lower_xs, self.lower_ys, probe_xs, probe_ys) >= 0
+        return inside
+
+    # The hull corner furthest in direction (dx, dy), as an index into the
+    # buffers the hull was found in.  Of corners that tie, any one may be given.
+    # Function Time Complexity: log h
+    # Function Space Complexity: c
+    def extreme(self, dx, dy):
+        self._check_direction(dx, dy)
+        if len(self.hull) < 3:
+            return int(self.hull[np.argmax(dx * self.hull_xs + dy * self.hull_ys)])
+        if dy == 0:
+            return int(self.hull[self.upper[-1]] if dx > 0 else self.hull[0])
+
+        positions, (chain_xs, chain_ys) = (self.upper, self.upper_chain) if dy > 0 else \
+            (self.lower, self.lower_chain)
+
+        # The first edge that doesn't go further in (dx, dy) starts at the peak
+        lo, hi = 0, len(chain_xs) - 1
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if dx * (chain_xs[mid + 1] - chain_xs[mid]) + dy * (chain_ys[mid + 1] - chain_ys[mid]) <= 0:
+                hi = mid
+            else:
+                lo = mid + 1
+        return int(self.hull[positions[lo]])
+
+    # extreme() for an (M, 2) array of directions (or dx and dy buffers), as an
+    # index array
+    # Function Time Complexity: M log h, vectorized
+    # Function Space Complexity: M
+    def extreme_many(self, directions, dys=None):
+        dxs, dys = as_coordinate_arrays(directions, dys)
+        if np.any((dxs == 0) & (dys == 0)):
+            raise ValueError('Directions must be non-zero')
+        if len(self.hull) == 0:
+            raise ValueError('The hull is empty')
+        if len(self.hull) < 3:
+            return self.hull[np.argmax(np.outer(dxs, self.hull_xs) + np.outer(dys, self.hull_ys), axis=1)]
+
+        extremes = np.where(dxs > 0, self.hull[self.upper[-1]], self.hull[0])  # right for dy == 0
+        for chain, chain_xs, chain_ys, picked in ((self.upper, self.upper_xs, self.upper_ys, dys > 0),
+                                                   (self.lower, self.lower_xs, self.lower_ys, dys < 0)):
+            picked = np.flatnonzero(picked)
+            peaks = _chain_peaks(chain_xs, chain_ys, dxs[picked], dys[picked])
+            extremes[picked] = self.hull[chain[peaks]]
+        return extremes
+
+    # (distance, a, b): the two hull corners furthest apart, as indices into the
+    # buffers the hull was found in, and the distance between them
+    # Function Time Complexity: h
+    # Function Space Complexity: c
+    def diameter(self):
+        return self._calipers()[0]
+
+    # The smallest distance between two parallel lines that have the hull
+    # between them
+    # Function Time Complexity: h
+    # Function Space Complexity: c
+    def width(self):
+        return self._calipers()[1]
+
+    # Rotating calipers: for each edge, the corner furthest from its line only
+    # ever moves forward around the hull.  That corner gives the width across
+    # the edge, and the diameter is always between it and one of the edge's ends.
+    def _calipers(self):
+        num_corners = len(self.hull)
+        if num_corners == 0:
+            raise ValueError('The hull is empty')
+        xs, ys = self.hull_xs.tolist(), self.hull_ys.tolist()
+        if num_corners < 3:
+            distance = math.hypot(xs[-1] - xs[0], ys[-1] - ys[0])
+            return (distance, int(self.hull[0]), int(self.hull[-1])), 0.0
+
+        def twice_area(i, k, j):
+            return abs((xs[k] - xs[i]) * (ys[j] - ys[i]) - (ys[k] - ys[i]) * (xs[j] - xs[i]))
+
+        best, best_pair, width = -1.0, (0, 0), math.inf
+        j = 1
+        for i in range(num_corners):
+            k = (i + 1) % num_corners
+            while twice_area(i, k, (j + 1) % num_corners) > twice_area(i, k, j):
+                j = (j + 1) % num_corners
+
+            width = min(width, twice_area(i, k, j) / math.hypot(xs[k] - xs[i], ys[k] - ys[i]))
+            for end in (i, k):
+                squared = (xs[j] - xs[end]) ** 2 + (ys[j] - ys[end]) ** 2
+                if squared > best:
+                    best, best_pair = squared, (end, j)
+        return (math.sqrt(best), int(self.hull[best_pair[0]]), int(self.hull[best_pair[1]])), width
+
+    # Orientation of (x, y) against the chain's edge spanning x: negative below
+    # it, positive above
+    def _chain_side(self, chain, x, y):
+        chain_xs, chain_ys = chain
+        k = min(max(bisect_right(chain_xs, x) - 1, 0), len(chain_xs) - 2)
+        return self.orient((chain_xs[k], chain_xs[k + 1], x), (chain_ys[k], chain_ys[k + 1], y), 0, 1, 2)
+
+    def _chain_sides(self, chain_xs, chain_ys, probe_xs, probe_ys):
+        k = np.clip(np.searchsorted(chain_xs, probe_xs, side='right') - 1, 0, len(chain_xs) - 2)
+        return orient_many(chain_xs[k], chain_ys[k], chain_xs[k + 1], chain_ys[k + 1], probe_xs, probe_ys,
+                           self.predicate)
+
+    # Containment for hulls of fewer than 3 corners: nothing, a point or a segment
+    def _contains_degenerate(self, probe_xs, probe_ys):
+        if len(self.hull) == 0:
+            return np.zeros(len(probe_xs), dtype=bool)
+
+        xs, ys = self.hull_xs, self.hull_ys
+        inside = (probe_xs >= xs.min()) & (probe_xs <= xs.max()) & (probe_ys >= ys.min()) & (probe_ys <= ys.max())
+        if len(self.hull) == 2:
+            inside &= orient_many(xs[0], ys[0], xs[1], ys[1], probe_xs, probe_ys, self.predicate) == 0
+        return inside
+
+    def _check_direction(self, dx, dy):
+        if dx == 0 and dy == 0:
+            raise ValueError('Directions must be non-zero')
+        if len(self.hull) == 0:
+            raise ValueError('The hull is empty')
+
+
+# The peak of dx * x + dy * y along an x-monotone chain, for many directions
+# at once, with a binary search run in lockstep: for every direction, the
+# position of the first edge that doesn't go further in it
+def _chain_peaks(chain_xs, chain_ys, dxs, dys):
+    edge_xs, edge_ys = np.diff(chain_xs), np.diff(chain_ys)
+    lo = np.zeros(len(dxs), dtype=np.intp)
+    hi = np.full(len(dxs), len(edge_xs), dtype=np.intp)
+
+    searching = np.flatnonzero(lo < hi)
+    while len(searching):
+        mid = (lo[searching] + hi[searching]) // 2
+        descending = dxs[searching] * edge_xs[mid] + dys[searching] * edge_ys[mid] <= 0
+        hi[searching[descending]] = mid[descending]
+        lo[searching[~descending]] = mid[~descending] + 1
+        searching = searching[lo[searching] < hi[searching]]
+    return lo
+
+
+# Finds the hull of an (N, 2) array (or x and y buffers) and indexes it; see
+# convex_hull_core.compute_hull_indices for the options
+def build_hull_index(points, ys=None, engine='auto', predicate='adaptive', prefilter=False):
+    xs, ys = as_coordinate_arrays(points, ys)
+    return HullIndex(xs, ys, solve_with_engine(xs, ys, engine, predicate, prefilter), predicate)
@@ -0,0 +1,99 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+from convex_hull_core import ArrayHullSolver, as_coordinate_arrays, get_orientation_predicate, presort, solve_sorted
+
+#
+# Parallel divide and conquer.  The presorted points are cut into contiguous
+# x-slabs, a pool of worker processes solves one slab each, and the parent merges
+# the slab hulls in a tree with ArrayHullSolver.combine_hull.  The sorted
+# coordinates go into shared memory so the slabs never have to be pickled; only
+# the (small) slab hulls travel back to the parent.
+#
+
+# Below this many points the pool costs more than it saves, so the serial
+# solver is used instead
+PARALLEL_THRESHOLD = 1000000
+
+
+# Runs in a worker process: attaches to the shared coordinates, solves
+# sorted points [lo, hi) and returns the hull as positions in the sorted
+# buffer, along with the offset of its rightmost corner
+def _solve_slab(shm_name, num_points, lo, hi, predicate):
+    shm = SharedMemory(name=shm_name)
+    try:
+        coords = np.ndarray((2, num_points), dtype=np.float64, buffer=shm.buf)
+        solver = ArrayHullSolver(coords[0, lo:hi], coords[1, lo:hi], np.arange(hi - lo),
+                                 get_orientation_predicate(predicate))
+        size, end = solver.solve_hull(0, hi - lo)
+        hull = np.array(solver.hulls[:size], dtype=np.intp) + lo
+
+        # Every view of the shared buffer has to be gone before it can be closed
+        del solver, coords
+        return hull, end
+    finally:
+        shm.close()
+
+
+# Same contract as convex_hull_core.solve_sorted, but splits the work across
+# up to `workers` processes (all cores if None).  `slabs` defaults to one per
+# worker.  Inputs smaller than `threshold` are solved serially.  progress is
+# called as each slab comes back; if it raises, the slabs not yet started are
+# dropped.
+def solve_sorted_parallel(xs, ys, order, predicate='adaptive', workers=None, slabs=None,
+                          threshold=PARALLEL_THRESHOLD, progress=None):
+    num_points = len(order)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if slabs is None:
+        slabs = workers
+    slabs = min(slabs, num_points // 4)  # each slab needs a few points to be worth a task
+    if workers <= 1 or slabs <= 1 or num_points < threshold:
+        return solve_sorted(xs, ys, order, predicate, progress=progress)
+
+    shm = SharedMemory(create=True, size=2 * num_points * np.dtype(np.float64).itemsize)
+    try:
+        coords = np.ndarray((2, num_points), dtype=np.float64, buffer=shm.buf)
+        np.take(xs, order, out=coords[0])
+        np.take(ys, order, out=coords[1])
+
+        bounds = np.linspace(0, num_points, slabs + 1).astype(np.intp).tolist()
+        slab_hulls = []
+        with ProcessPoolExecutor(max_workers=min(workers, slabs)) as pool:
+            try:
+                for result in pool.map(_solve_slab, [shm.name] * slabs, [num_points] * slabs,
+                                       bounds[:-1], bounds[1:], [predicate] * slabs):
+                    slab_hulls.append(result)
+                    if progress is not None:
+                        progress(bounds[len(slab_hulls)], num_points)
+            except BaseException:
+                pool.shutdown(cancel_futures=True)
+                raise
+
+        # Lay the slab hulls out next to each other and merge them in a tree
+        pieces = []
+        start = 0
+        for hull, end in slab_hulls:
+            pieces.append((start, len(hull), end))
+            start += len(hull)
+        merger = ArrayHullSolver(coords[0], coords[1], np.concatenate([hull for hull, _ in slab_hulls]),
+                                 get_orientation_predicate(predicate))
+        merger.hulls[:] = merger.order
+        start, size, _ = merger.merge_hulls(pieces)
+        hull = np.asarray(order)[np.array(merger.hulls[start:start + size], dtype=np.intp)]
+
+        del merger, coords
+        return hull
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+# Parallel counterpart of convex_hull_core.compute_hull_indices
+def compute_hull_parallel(points, ys=None, predicate='adaptive', workers=None, slabs=None,
+                          threshold=PARALLEL_THRESHOLD):
+    xs, ys = as_coordinate_arrays(points, ys)
+    return solve_sorted_parallel(xs, ys, presort(xs, ys), predicate, workers, slabs, threshold)
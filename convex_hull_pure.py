@@ -0,0 +1,70 @@
+from array import array
+
+from convex_hull_core import ArrayHullSolver, get_orientation_predicate, monotone_chains
+
+#
+# Convex hull without numpy, for deployments that don't have it.  Points are
+# kept as two array('d') coordinate buffers (8 bytes a coordinate, no object
+# per point) and everything else is a C long array of indices into them, the
+# same layout the numpy path uses, so the divide and conquer is
+# convex_hull_core.ArrayHullSolver itself.  Hulls come back as array('l')
+# rather than numpy arrays, in the same order.
+#
+
+PURE_ENGINES = ('dc', 'monotone')
+
+
+# Turns (x, y) pairs, or separate x and y sequences, into a pair of array('d')
+# buffers
+def as_coordinate_buffers(points, ys=None):
+    if ys is not None:
+        xs, ys = array('d', points), array('d', ys)
+        if len(xs) != len(ys):
+            raise ValueError('x and y buffers must be the same length, got {} and {}'.format(len(xs), len(ys)))
+        return xs, ys
+
+    xs, ys = array('d'), array('d')
+    for x, y in points:
+        xs.append(x)
+        ys.append(y)
+    return xs, ys
+
+
+# Same as convex_hull_core.presort: the indices in increasing x, then y, order,
+# with exact duplicates dropped.  Sorting on y and then (stably) on x is quicker
+# than building a tuple key per point.
+# Function Time Complexity: n log n
+# Function Space Complexity: n
+def presort_buffers(xs, ys):
+    order = sorted(range(len(xs)), key=ys.__getitem__)
+    order.sort(key=xs.__getitem__)
+
+    kept = array('l')
+    last_x = last_y = None
+    for i in order:
+        x, y = xs[i], ys[i]
+        if x != last_x or y != last_y:
+            kept.append(i)
+            last_x, last_y = x, y
+    return kept
+
+
+# Pure Python counterpart of convex_hull_core.compute_hull_indices: the hull as
+# an array('l') of indices into the input, clockwise from the leftmost point.
+# engine is 'dc' (the divide and conquer) or 'monotone'.
+# Function Time Complexity: n log n
+# Function Space Complexity: n
+def compute_hull_indices(points, ys=None, engine='dc', predicate='adaptive'):
+    if engine not in PURE_ENGINES:
+        raise ValueError('Unknown pure Python hull engine {!r}, expected one of {}'.format(
+            engine, ', '.join(PURE_ENGINES)))
+    orient = get_orientation_predicate(predicate)
+    xs, ys = as_coordinate_buffers(points, ys)
+    order = presort_buffers(xs, ys)
+    if len(order) == 0:
+        return array('l')
+
+    if engine == 'dc':
+        return array('l', ArrayHullSolver(xs, ys, order, orient).solve())  # a numpy array, if numpy is there
+    upper, lower = monotone_chains(xs, ys, order, orient)
+    return array('l', upper + lower[1:-1])
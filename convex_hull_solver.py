@@ -0,0 +1,99 @@
+import time
+from functools import partial
+
+from convex_hull_cache import hull_key
+from convex_hull_core import as_coordinate_arrays, solve_sorted, solve_with_engine
+
+#
+# The solve itself, without PyQt: which engine runs, with what options, and the
+# stats it leaves behind.  convex_hull.ConvexHullSolver is a thin Qt adapter
+# around this that draws the result; batch workers can use HullSolver directly
+# and never pay for importing Qt.
+#
+
+
+#
+# Finds hulls of coordinate buffers with one engine and set of options.
+#
+class HullSolver:
+    # Class constructor.  engine is one of convex_hull_core.ENGINES or 'auto'.
+    # With the divide and conquer engine, workers > 1 (or None for one per core)
+    # solves inputs of at least parallel_threshold points (by default
+    # convex_hull_parallel.PARALLEL_THRESHOLD) on a process pool.  With prefilter
+    # on, points inside the Akl-Toussaint octagon are dropped first.  With
+    # collect_stats on, the serial divide and conquer also fills in
+    # convex_hull_core.InstrumentedHullSolver's counters.  With a
+    # convex_hull_cache.HullCache as cache, point sets that have been solved
+    # before (with the same engine and prefilter) skip the sort and the engine.
+    def __init__(self, engine='dc', prefilter=False, workers=1, parallel_threshold=None, collect_stats=False,
+                 cache=None):
+        self.engine = engine
+        self.prefilter = prefilter
+        self.workers = workers
+        self.parallel_threshold = parallel_threshold
+        self.collect_stats = collect_stats
+        self.cache = cache
+
+    # Sorts the points by increasing x (if the engine needs it) and then finds
+    # the hull, timing the two separately.  Returns the hull's indices into xs
+    # and ys and convex_hull_core.solve_with_engine's stats, plus 'counters',
+    # 'cached' (whether the hull came from the cache) and 'cache' (seconds spent
+    # looking it up).  A trace records the divide and conquer's steps (and so
+    # forces that engine, and bypasses the cache, since a cached hull has no
+    # steps to show); progress is called as it merges, and may raise to stop it.
+    # Function Time Complexity: n log n, or n on a cache hit
+    # Function Space Complexity: n
+    def solve(self, xs, ys, trace=None, progress=None):
+        key = None
+        t1 = time.time()
+        if self.cache is not None and trace is None:
+            key = hull_key(xs, ys, engine=self.engine, prefilter=self.prefilter)
+            hull = self.cache.get(key)
+            if hull is not None:
+                stats = {'engine': 'cache', 'culled': 0, 'prefilter': 0.0, 'sort': 0.0, 'hull': 0.0, 'counters': {},
+                         'cached': True, 'cache': time.time() - t1}
+                return hull, stats
+        t2 = time.time()
+
+        counters = {} if self.collect_stats else None
+        engine = self.engine
+        if trace is not None:
+            engine = partial(solve_sorted, trace=trace, progress=progress, counters=counters)
+        elif engine == 'dc' and self.workers != 1:
+            engine = self._parallel_engine(progress)
+        elif engine == 'dc':
+            engine = partial(solve_sorted, progress=progress, counters=counters)
+
+        stats = {}
+        hull = solve_with_engine(xs, ys, engine, prefilter=self.prefilter, stats=stats)
+        stats['counters'] = counters or {}
+        stats['cached'] = False
+        stats['cache'] = t2 - t1
+        if key is not None:
+            self.cache.put(key, hull)
+        return hull, stats
+
+    # The same, for an (N, 2) array (or separate x and y buffers)
+    def solve_points(self, points, ys=None, trace=None, progress=None):
+        xs, ys = as_coordinate_arrays(points, ys)
+        return self.solve(xs, ys, trace, progress)
+
+    # The process pool machinery (concurrent.futures, multiprocessing) costs more
+    # to import than the rest of the solver put together, so it's only loaded
+    # once a parallel solve is actually asked for
+    def _parallel_engine(self, progress):
+        from convex_hull_parallel import PARALLEL_THRESHOLD, solve_sorted_parallel
+
+        threshold = PARALLEL_THRESHOLD if self.parallel_threshold is None else self.parallel_threshold
+        return partial(solve_sorted_parallel, workers=self.workers, threshold=threshold, progress=progress)
+
+
+# Flattens a solve's stats into one dict of phase times and counters, the form
+# ConvexHullSolver.stats and the profiled signal use (the time to build the
+# hull's polygon is added by the caller)
+def profile_stats(stats, num_points, hull_size):
+    profile = {'points': num_points, 'hull_size': hull_size, 'engine': stats['engine'], 'culled': stats['culled'],
+               'prefilter': stats['prefilter'], 'presort': stats['sort'], 'recursion': stats['hull'],
+               'cached': stats['cached'], 'cache': stats['cache']}
+    profile.update(stats['counters'])
+    return profile
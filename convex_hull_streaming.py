@@ -0,0 +1,99 @@
+import numpy as np
+
+from convex_hull_core import ArrayHullSolver, as_coordinate_arrays, get_orientation_predicate, presort, \
+    solve_with_engine
+
+#
+# Running hull over points that arrive in batches.  Only the corners of the hull
+# so far are kept, so memory is O(h + batch) no matter how many points have
+# gone by.
+#
+
+
+class StreamingHull:
+
+    # engine, predicate and prefilter are used to reduce each incoming batch to
+    # its own hull; see convex_hull_core.solve_with_engine
+    def __init__(self, engine='auto', predicate='adaptive', prefilter=True):
+        self.engine = engine
+        self.predicate = predicate
+        self.prefilter = prefilter
+        self.orient = get_orientation_predicate(predicate)
+
+        # Corners of the hull so far, clockwise from the leftmost one, with the
+        # position of each in the overall stream of points
+        self.xs = np.empty(0, dtype=np.float64)
+        self.ys = np.empty(0, dtype=np.float64)
+        self.ids = np.empty(0, dtype=np.intp)
+        self.count = 0
+
+    # Adds a batch of points (an (N, 2) array, or x and y buffers) and returns
+    # self, so calls can be chained
+    # Function Time Complexity: batch log batch + h log h
+    # Function Space Complexity: batch + h
+    def add_batch(self, points, ys=None):
+        xs, ys = as_coordinate_arrays(points, ys)
+        if len(xs) == 0:
+            return self
+
+        batch = solve_with_engine(xs, ys, self.engine, self.predicate, self.prefilter)
+        batch_xs, batch_ys, batch_ids = xs[batch], ys[batch], batch + self.count
+        self.count += len(xs)
+
+        if len(self.xs) == 0:
+            self.xs, self.ys, self.ids = batch_xs, batch_ys, batch_ids
+            return self
+
+        # When the batch is entirely to one side of the hull so far, the two
+        # hulls can be joined with a single merge.  Both are stored clockwise from
+        # their leftmost corner, so index 0 is the smallest point of each.
+        running_end = self._rightmost(self.xs, self.ys)
+        batch_end = self._rightmost(batch_xs, batch_ys)
+        if (self.xs[running_end], self.ys[running_end]) < (batch_xs[0], batch_ys[0]):
+            self._merge(self.xs, self.ys, self.ids, running_end, batch_xs, batch_ys, batch_ids, batch_end)
+        elif (batch_xs[batch_end], batch_ys[batch_end]) < (self.xs[0], self.ys[0]):
+            self._merge(batch_xs, batch_ys, batch_ids, batch_end, self.xs, self.ys, self.ids, running_end)
+        else:
+            # Otherwise the new hull is the hull of the two sets of corners
+            xs = np.concatenate((self.xs, batch_xs))
+            ys = np.concatenate((self.ys, batch_ys))
+            ids = np.concatenate((self.ids, batch_ids))
+            corners = ArrayHullSolver(xs, ys, presort(xs, ys), self.orient).solve()
+            self.xs, self.ys, self.ids = xs[corners], ys[corners], ids[corners]
+        return self
+
+    # Adds every batch from an iterable (a list, a generator reading files, ...)
+    def add_batches(self, batches):
+        for batch in batches:
+            self.add_batch(batch)
+        return self
+
+    # The corners of the hull so far as an (h, 2) array, clockwise from the
+    # leftmost one
+    def hull(self):
+        return np.column_stack((self.xs, self.ys))
+
+    # Positions of the corners in the overall stream of points, in the same
+    # order as hull()
+    def hull_indices(self):
+        return self.ids.copy()
+
+    # Offset of the lexicographically largest corner of a hull stored clockwise
+    # from its leftmost corner
+    @staticmethod
+    def _rightmost(xs, ys):
+        return int(np.lexsort((ys, xs))[-1])
+
+    # Joins a hull with one entirely to its right using ArrayHullSolver's
+    # tangent walks
+    def _merge(self, left_xs, left_ys, left_ids, left_end, right_xs, right_ys, right_ids, right_end):
+        xs = np.concatenate((left_xs, right_xs))
+        ys = np.concatenate((left_ys, right_ys))
+        ids = np.concatenate((left_ids, right_ids))
+
+        merger = ArrayHullSolver(xs, ys, np.arange(len(xs)), self.orient)
+        merger.hulls[:] = merger.order
+        left_size = len(left_xs)
+        start, size, _ = merger.merge_hulls([(0, left_size, left_end), (left_size, len(right_xs), right_end)])
+        corners = np.array(merger.hulls[start:start + size], dtype=np.intp)
+        self.xs, self.ys, self.ids = xs[corners], ys[corners], ids[corners]
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+
+import argparse
+import itertools
+import os
+import sys
+import time
+
+import numpy as np
+
+from convex_hull_core import ENGINES, ORIENTATION_PREDICATES
+from convex_hull_streaming import StreamingHull
+
+#
+# Command line hull of a point file, without PyQt.  Inputs can be
+#   .npy:  an (N, 2) array, memory-mapped
+#   raw:   little-endian float64 x, y pairs, memory-mapped
+#   csv:   one point per line, read a chunk of lines at a time
+# and are fed through a StreamingHull in chunks, so only one chunk of points
+# (plus the hull so far) is ever in memory, however large the file.
+#
+#   python hull_cli.py points.npy -o hull.npy
+#   python hull_cli.py dump.bin --coordinates -o hull.csv
+#
+
+DEFAULT_CHUNK_SIZE = 1 << 22  # points per chunk (64 MB of float64 pairs)
+
+
+# Works out the input format from the file name: .npy, .csv/.txt, or raw
+def guess_format(path):
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.npy':
+        return 'npy'
+    if extension in ('.csv', '.txt'):
+        return 'csv'
+    return 'raw'
+
+
+# Memory-maps a binary point file as an (N, 2) array, without reading it
+def map_points(path, input_format):
+    if input_format == 'npy':
+        points = np.load(path, mmap_mode='r')
+        if points.ndim != 2 or points.shape[1] != 2:
+            raise ValueError('{}: expected an (N, 2) array, got shape {}'.format(path, points.shape))
+        return points
+
+    size = os.path.getsize(path)
+    if size % 16 != 0:
+        raise ValueError('{}: {} bytes is not a whole number of float64 (x, y) pairs'.format(path, size))
+    if size == 0:
+        return np.empty((0, 2), dtype=np.float64)
+    return np.memmap(path, dtype='<f8', mode='r', shape=(size // 16, 2))
+
+
+# Yields (chunk_size, 2) float64 arrays from a point file (the last one shorter)
+def read_chunks(path, input_format, chunk_size=DEFAULT_CHUNK_SIZE, delimiter=',', skip_rows=0):
+    if input_format == 'csv':
+        with open(path) as file:
+            lines = itertools.islice(file, skip_rows, None)
+            while True:
+                block = list(itertools.islice(lines, chunk_size))
+                if not block:
+                    return
+                yield np.loadtxt(block, dtype=np.float64, delimiter=delimiter, usecols=(0, 1), ndmin=2)
+        return
+
+    points = map_points(path, input_format)
+    for start in range(0, len(points), chunk_size):
+        yield points[start:start + chunk_size]
+
+
+# Writes the hull (indices, or an (h, 2) array of coordinates) as .npy, as
+# text (.csv/.txt, or '-' for stdout), or as raw little-endian binary
+def write_hull(hull, path):
+    if path == '-':
+        _write_text(hull, sys.stdout)
+        return
+
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.npy':
+        np.save(path, hull)
+    elif extension in ('.csv', '.txt'):
+        with open(path, 'w') as file:
+            _write_text(hull, file)
+    else:
+        hull.astype('<f8' if hull.dtype.kind == 'f' else '<i8').tofile(path)
+
+
+def _write_text(hull, file):
+    np.savetxt(file, hull, fmt='%d' if hull.dtype.kind == 'i' else '%.17g', delimiter=',')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Find the convex hull of a point file.')
+    parser.add_argument('input', help='.npy, .csv/.txt, or raw float64 (x, y) pairs')
+    parser.add_argument('-o', '--output', default='-',
+                        help='.npy, .csv/.txt or raw binary, by extension (default: text to stdout)')
+    parser.add_argument('--format', choices=('npy', 'raw', 'csv'), help='input format (default: by extension)')
+    parser.add_argument('--coordinates', action='store_true',
+                        help='write the hull corners\' coordinates rather than their indices in the input')
+    parser.add_argument('--engine', choices=sorted(ENGINES) + ['auto'], default='auto')
+    parser.add_argument('--predicate', choices=sorted(ORIENTATION_PREDICATES), default='adaptive')
+    parser.add_argument('--no-prefilter', action='store_true', help='don\'t drop interior points before each chunk')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help='points per chunk')
+    parser.add_argument('--delimiter', default=',', help='csv field separator')
+    parser.add_argument('--skip-rows', type=int, default=0, help='csv header lines to skip')
+    parser.add_argument('--quiet', action='store_true', help='don\'t report the timing on stderr')
+    args = parser.parse_args(argv)
+
+    if args.chunk_size <= 0:
+        parser.error('--chunk-size must be positive')
+    if args.skip_rows < 0:
+        parser.error('--skip-rows can\'t be negative')
+
+    # Unreadable or malformed input (a missing file, a wrongly shaped array, a
+    # bad csv row) is reported as a usage error rather than a traceback
+    input_format = args.format or guess_format(args.input)
+    start = time.time()
+    hull = StreamingHull(args.engine, args.predicate, not args.no_prefilter)
+    try:
+        hull.add_batches(read_chunks(args.input, input_format, args.chunk_size, args.delimiter, args.skip_rows))
+    except (OSError, ValueError) as error:
+        parser.error(str(error))
+    elapsed = time.time() - start
+
+    try:
+        write_hull(hull.hull() if args.coordinates else hull.hull_indices(), args.output)
+    except OSError as error:
+        parser.error(str(error))
+    if not args.quiet:
+        print('{} points, {} on the hull, {:.3f} sec'.format(hull.count, len(hull.ids), elapsed), file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+import numpy as np
+
+#
+# Random point sets for the hull, generated in bulk with numpy.  Every
+# distribution is sampled directly (no rejection loop), so n points always cost
+# a fixed handful of vectorized draws.  The same seed always gives the same
+# points.
+#
+
+# Radius of the disc all the distributions are confined to
+MAX_RADIUS = 0.98
+
+# Standard deviation of the Gaussian distribution
+GAUSSIAN_SIGMA = 0.25
+
+
+# All three distributions are round, so each one only has to draw a radius; the
+# angle is uniform.  The radius samplers work in place on an array of uniform
+# draws to keep the number of temporaries (and passes over memory) down.
+
+# Uniform over the disc: the radius is the square root of a uniform draw, so the
+# density per unit area is flat
+def uniform_disc(rng, n, radius=MAX_RADIUS):
+    r = rng.random(n)
+    np.sqrt(r, out=r)
+    r *= radius
+    return _polar(rng, r)
+
+
+# Uniform over a ball, projected onto the plane.  The projected radius s (as a
+# share of the ball's) has CDF 1 - (1 - s^2)^(3/2), which inverts to
+# s = sqrt(1 - u^(2/3)).
+def sphere_projection(rng, n, radius=MAX_RADIUS):
+    r = rng.random(n)
+    np.cbrt(r, out=r)
+    np.square(r, out=r)
+    np.subtract(1.0, r, out=r)
+    np.sqrt(r, out=r)
+    r *= radius
+    return _polar(rng, r)
+
+
+# A round Gaussian cut off at the edge of the disc.  The radius of a 2D Gaussian
+# is Rayleigh distributed, so it's drawn by inverting the Rayleigh CDF over just
+# the part of it inside the disc.
+def truncated_gaussian(rng, n, radius=MAX_RADIUS, sigma=GAUSSIAN_SIGMA):
+    inside = -np.expm1(-radius ** 2 / (2.0 * sigma ** 2))  # share of the Gaussian within radius
+    r = rng.random(n)
+    r *= -inside
+    np.log1p(r, out=r)
+    r *= -2.0 * sigma ** 2
+    np.sqrt(r, out=r)
+    return _polar(rng, r)
+
+
+# Points at radius r and a uniform random angle.  They're built as two rows and
+# handed back transposed, so each coordinate is still one contiguous buffer.
+# Only a sine is evaluated, over a half turn: one uniform draw t in [-1, 1)
+# gives the angle from |t| and the side (the sign of x) from the sign of t, and
+# x is then sqrt((1 - y)(1 + y)), which is much cheaper than a cosine.
+def _polar(rng, r):
+    t = rng.random(len(r))
+    t *= 2.0
+    t -= 1.0
+
+    points = np.empty((2, len(r)), dtype=np.float64)
+    xs, ys = points
+    np.abs(t, out=ys)
+    ys -= 0.5
+    ys *= np.pi
+    np.sin(ys, out=ys)
+
+    np.subtract(1.0, ys, out=xs)
+    xs *= 1.0 + ys
+    np.sqrt(xs, out=xs)
+    np.copysign(xs, t, out=xs)
+
+    points *= r
+    return points.T
+
+
+DISTRIBUTIONS = {
+    'uniform': uniform_disc,
+    'sphere': sphere_projection,
+    'gaussian': truncated_gaussian,
+}
+
+
+# n points from one of the DISTRIBUTIONS as an (n, 2) float64 array (stored
+# column-major, so points[:, 0] and points[:, 1] are contiguous).  seed is
+# anything np.random.default_rng takes (None for a fresh, unpredictable one).
+# Function Time Complexity: n
+# Function Space Complexity: n
+def generate_points(n, distribution='uniform', seed=None):
+    try:
+        sampler = DISTRIBUTIONS[distribution]
+    except KeyError:
+        raise ValueError('Unknown distribution {!r}, expected one of {}'.format(
+            distribution, ', '.join(sorted(DISTRIBUTIONS)))) from None
+    return sampler(np.random.default_rng(seed), int(n))
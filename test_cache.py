@@ -0,0 +1,102 @@
+import numpy as np
+
+from convex_hull_cache import HullCache, hull_key
+from convex_hull_core import HullTrace, compute_hull_indices
+from convex_hull_solver import HullSolver
+
+#
+# HullCache's two tiers (the byte-bounded LRU in memory and the .npy files on
+# disk) and HullSolver's use of it.  Hulls are intp arrays, so one of n indices
+# takes 8 * n bytes of the memory bound.
+#
+
+
+def hull_of(size):
+    return np.arange(size, dtype=np.intp)
+
+
+def test_key():
+    xs, ys = np.array([0.0, 1.0]), np.array([1.0, 0.0])
+    assert hull_key(xs, ys, engine='dc') == hull_key(xs.copy(), ys.copy(), engine='dc')
+    assert hull_key(xs, ys, engine='dc') != hull_key(xs, ys, engine='chan')
+    assert hull_key(xs, ys, engine='dc') != hull_key(ys, xs, engine='dc')
+
+
+# The least recently used hull goes first, once the bytes pass the bound
+def test_lru_eviction():
+    cache = HullCache(max_bytes=8 * 10)
+    cache.put('a', hull_of(4))
+    cache.put('b', hull_of(4))
+    cache.get('a')
+    cache.put('c', hull_of(4))
+    assert 'a' in cache and 'b' not in cache and 'c' in cache
+    assert cache.get('b') is None
+
+    stats = cache.stats()
+    assert stats['evictions'] == 1
+    assert stats['bytes'] == 8 * 8
+    assert (stats['hits'], stats['misses']) == (1, 1)
+
+
+# A hull bigger than the whole bound would evict everything and still not fit,
+# so it's kept out of memory (though it still goes to disk)
+def test_oversized_hull(tmp_path):
+    cache = HullCache(max_bytes=8 * 4, directory=str(tmp_path))
+    cache.put('small', hull_of(2))
+    cache.put('large', hull_of(5))
+    assert len(cache) == 1 and cache.stats()['bytes'] == 8 * 2
+    assert cache.stats()['evictions'] == 0
+
+    assert cache.get('large').tolist() == list(range(5))
+    assert cache.stats()['disk_hits'] == 1
+    assert len(cache) == 1
+
+
+def test_disk_tier(tmp_path):
+    HullCache(directory=str(tmp_path)).put('key', hull_of(3))
+
+    cache = HullCache(directory=str(tmp_path))
+    assert len(cache) == 0 and 'key' in cache
+    assert cache.get('key').tolist() == [0, 1, 2]
+    assert cache.get('key').tolist() == [0, 1, 2]
+    assert (cache.stats()['disk_hits'], cache.stats()['hits']) == (1, 1)
+
+    cache.clear(disk=True)
+    assert 'key' not in cache
+    assert HullCache(directory=str(tmp_path)).get('key') is None
+
+
+# Neither changing a hull after putting it nor changing one that get() gave
+# back may change what's cached
+def test_copies():
+    cache = HullCache()
+    hull = hull_of(3)
+    cache.put('key', hull)
+    hull[0] = 7
+    got = cache.get('key')
+    got[1] = 7
+    assert cache.get('key').tolist() == [0, 1, 2]
+
+
+def test_solver_cache():
+    points = np.random.default_rng(4).random((500, 2))
+    xs, ys = np.ascontiguousarray(points[:, 0]), np.ascontiguousarray(points[:, 1])
+    expected = compute_hull_indices(points).tolist()
+    cache = HullCache()
+    solver = HullSolver(cache=cache)
+
+    hull, stats = solver.solve(xs, ys)
+    assert hull.tolist() == expected and not stats['cached']
+    hull, stats = solver.solve(xs, ys)
+    assert hull.tolist() == expected and stats['cached'] and stats['engine'] == 'cache'
+
+    # Other options are solved (and filed) separately
+    _, stats = HullSolver(engine='monotone', cache=cache).solve(xs, ys)
+    assert not stats['cached'] and len(cache) == 2
+
+    # A cached hull has no steps to replay, so a traced solve skips the cache
+    lookups = cache.stats()
+    trace = HullTrace()
+    hull, stats = solver.solve(xs, ys, trace=trace)
+    assert hull.tolist() == expected and not stats['cached'] and len(trace) > 0
+    assert cache.stats() == lookups
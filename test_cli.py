@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+
+import hull_cli
+from convex_hull_core import compute_hull_indices
+from point_generator import generate_points
+
+
+@pytest.fixture
+def points():
+    return generate_points(5000, 'gaussian', 11)
+
+
+@pytest.mark.parametrize('extension', ['.npy', '.bin', '.csv'])
+def test_round_trip(tmp_path, points, extension):
+    path = str(tmp_path / ('points' + extension))
+    if extension == '.npy':
+        np.save(path, points)
+    elif extension == '.bin':
+        np.ascontiguousarray(points, dtype='<f8').tofile(path)
+    else:
+        np.savetxt(path, points, delimiter=',', header='x,y', comments='', fmt='%.17g')
+    output = str(tmp_path / 'hull.npy')
+
+    hull_cli.main([path, '-o', output, '--chunk-size', '700', '--skip-rows', '1', '--quiet'])
+    assert np.load(output).tolist() == compute_hull_indices(points).tolist()
+
+
+@pytest.mark.parametrize('contents, arguments', [
+    (np.zeros((5, 3)), []),
+    (np.zeros((5, 2)), ['--chunk-size', '0']),
+    (None, []),
+])
+def test_bad_input_is_a_usage_error(tmp_path, capsys, contents, arguments):
+    path = str(tmp_path / 'points.npy')
+    if contents is not None:
+        np.save(path, contents)
+    with pytest.raises(SystemExit) as exit_info:
+        hull_cli.main([path, '--quiet'] + arguments)
+    assert exit_info.value.code == 2
+    assert 'error:' in capsys.readouterr().err
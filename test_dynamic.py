@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+
+from convex_hull_core import compute_hull_indices
+from convex_hull_dynamic import DynamicHull
+from test_index import brute_contains
+
+#
+# DynamicHull against the static solver: after every insert or delete of a
+# random sequence, hull() has to be the hull of the points that are left (with
+# their duplicates), and contains() has to agree with brute force.  The inputs
+# are the ones that trip bridges up: grids, collinear runs and repeated x.
+#
+
+
+def grid(rng, size):
+    return rng.integers(0, 6, (size, 2)).astype(float)
+
+
+def collinear(rng, size):
+    x = rng.integers(0, 20, size).astype(float)
+    return np.c_[x, 2 * x + 1]
+
+
+def repeated_x(rng, size):
+    return np.c_[rng.integers(0, 4, size), rng.integers(0, 10, size) / 4]
+
+
+def check(dynamic, points, rng):
+    expected = points[compute_hull_indices(points)] if len(points) else np.empty((0, 2))
+    assert dynamic.hull().tolist() == expected.tolist()
+    assert len(dynamic) == len(points)
+
+    # Probes on and around the points, including half-integer ones that land on
+    # grid hulls' edges
+    probes = np.concatenate([points, np.round(rng.random((30, 2)) * 24 - 2) / 2]).tolist()
+    hull_xs, hull_ys = expected[:, 0].tolist(), expected[:, 1].tolist()
+    assert [dynamic.contains(x, y) for x, y in probes] == [brute_contains(hull_xs, hull_ys, x, y) for x, y in probes]
+    # contains() borrows a scratch slot for the probe, which mustn't leak into the hull
+    assert dynamic.hull().tolist() == expected.tolist()
+
+
+@pytest.mark.parametrize('make_points', [grid, collinear, repeated_x])
+@pytest.mark.parametrize('initial', [0, 30])
+def test_random_updates(make_points, initial):
+    rng = np.random.default_rng(initial + len(make_points.__name__))
+    points = make_points(rng, initial)
+    dynamic = DynamicHull(points)
+    check(dynamic, points, rng)
+
+    for _ in range(150):
+        if len(points) and rng.random() < 0.4:
+            k = rng.integers(len(points))
+            dynamic.delete(*points[k])
+            points = np.delete(points, k, axis=0)
+        else:
+            point = make_points(rng, 1)
+            dynamic.insert(*point[0])
+            points = np.concatenate([points, point])
+        check(dynamic, points, rng)
+
+
+def test_delete_missing():
+    dynamic = DynamicHull([(0, 0), (1, 1)])
+    with pytest.raises(KeyError):
+        dynamic.delete(2, 2)
+    dynamic.delete(1, 1)
+    with pytest.raises(KeyError):
+        dynamic.delete(1, 1)
@@ -0,0 +1,105 @@
+import numpy as np
+import pytest
+
+import convex_hull_core
+from convex_hull_batch import compute_hulls
+from convex_hull_core import ENGINES, HullTrace, compute_hull_indices, presort, solve_sorted
+
+#
+# Every engine has to give the same canonical hull (strict corners only,
+# clockwise from the lexicographically smallest point), so they're all checked
+# against the monotone chain with the exact predicate on the inputs that break
+# hulls: duplicates, repeated x, collinear runs and nearly collinear points.
+#
+
+ENGINE_NAMES = sorted(ENGINES) + ['auto']
+PREDICATES = ['adaptive', 'exact']
+
+
+def reference_hull(points):
+    return compute_hull_indices(points, engine='monotone', predicate='exact').tolist()
+
+
+def degenerate_point_sets():
+    rng = np.random.default_rng(312)
+    point_sets = {
+        'empty': np.empty((0, 2)),
+        'single': np.array([[0.5, 0.5]]),
+        'duplicates': np.array([[1.0, 2.0]] * 5 + [[3.0, 4.0]] * 3),
+        'vertical': np.c_[np.zeros(20), rng.random(20)],
+        'horizontal': np.c_[rng.random(20), np.ones(20)],
+        'collinear': np.c_[np.arange(30.0), 2 * np.arange(30.0) + 1],
+        'square': np.array([[0, 0], [0, 1], [1, 0], [1, 1], [0.5, 0], [0, 0.5], [0.5, 0.5]], dtype=float),
+    }
+    for k in range(5):
+        point_sets['grid{}'.format(k)] = rng.integers(0, 6, (200, 2)).astype(float)
+        point_sets['repeated_x{}'.format(k)] = np.c_[rng.integers(0, 4, 100), rng.random(100)]
+    for k in range(40):
+        t = rng.random(30)
+        point_sets['near_collinear{}'.format(k)] = np.c_[t, 3 * t + 0.1]
+    return point_sets
+
+
+POINT_SETS = degenerate_point_sets()
+
+
+@pytest.mark.parametrize('predicate', PREDICATES)
+@pytest.mark.parametrize('engine', ENGINE_NAMES)
+def test_engines_match_reference(engine, predicate):
+    for name, points in POINT_SETS.items():
+        hull = compute_hull_indices(points, engine=engine, predicate=predicate).tolist()
+        assert hull == reference_hull(points), name
+
+
+@pytest.mark.parametrize('engine', ENGINE_NAMES)
+def test_prefilter_keeps_hull(engine):
+    rng = np.random.default_rng(7)
+    for points in (rng.random((2000, 2)), rng.integers(0, 20, (2000, 2)).astype(float)):
+        hull = compute_hull_indices(points, engine=engine, prefilter=True).tolist()
+        assert hull == reference_hull(points)
+
+
+# Chan's algorithm only groups inputs of more than CHAN_GROUP_SIZE points, so
+# it's also run with tiny groups, which wraps every set above and takes several
+# rounds (and the filtering between them) on the larger ones
+@pytest.mark.parametrize('group_size', [2, 3, 16])
+def test_chan_small_groups(monkeypatch, group_size):
+    monkeypatch.setattr(convex_hull_core, 'CHAN_GROUP_SIZE', group_size)
+    rng = np.random.default_rng(group_size)
+    point_sets = list(POINT_SETS.values()) + [rng.random((3000, 2)), rng.integers(0, 30, (3000, 2)).astype(float)]
+    for predicate in PREDICATES:
+        for points in point_sets:
+            assert compute_hull_indices(points, engine='chan', predicate=predicate).tolist() == reference_hull(points)
+
+
+# Every HULL event of a trace is the hull of the sorted points [lo, hi), and the
+# last one covers all of them
+def test_trace_hull_events():
+    for points in (np.random.default_rng(9).random((300, 2)), POINT_SETS['grid0'], POINT_SETS['repeated_x0']):
+        xs, ys = np.ascontiguousarray(points[:, 0]), np.ascontiguousarray(points[:, 1])
+        order = presort(xs, ys)
+        trace = HullTrace()
+        solve_sorted(xs, ys, order, trace=trace)
+        events = [event for event in trace if event[0] == HullTrace.HULL]
+        for _, lo, hi, corners in events:
+            expected = order[lo:hi][compute_hull_indices(xs[order[lo:hi]], ys[order[lo:hi]])]
+            assert corners.tolist() == expected.tolist(), (lo, hi)
+        assert events[-1][1:3] == (0, len(order))
+
+
+# The auto policy hands large inputs with small hulls to QuickHull, so that has
+# to hold up on a big, nearly collinear input too
+def test_auto_near_collinear_large():
+    t = np.random.default_rng(0).random(20000)
+    points = np.c_[t, 3 * t + 0.1]
+    assert compute_hull_indices(points).tolist() == compute_hull_indices(points, engine='monotone').tolist()
+
+
+# compute_hulls solves many instances together, and must give each one the hull
+# it would get alone, including instances past BATCH_WIDTH_LIMIT
+def test_batch_matches_reference():
+    point_sets = list(POINT_SETS.values()) + [np.random.default_rng(3).random((500, 2))]
+    offsets = np.cumsum([0] + [len(points) for points in point_sets])
+    hulls, hull_offsets = compute_hulls(np.concatenate(point_sets), offsets)
+    for k, points in enumerate(point_sets):
+        assert (hulls[hull_offsets[k]:hull_offsets[k + 1]] - offsets[k]).tolist() == reference_hull(points)
@@ -0,0 +1,115 @@
+import math
+from fractions import Fraction
+
+import numpy as np
+import pytest
+
+from convex_hull_index import build_hull_index
+
+#
+# HullIndex against brute force: containment by testing every edge exactly,
+# extremes by the largest dot product over all the points, the diameter over all
+# pairs, and the width over every edge's normal.
+#
+
+
+def brute_contains(hull_xs, hull_ys, x, y):
+    num_corners = len(hull_xs)
+    if num_corners == 0:
+        return False
+    if num_corners == 1:
+        return x == hull_xs[0] and y == hull_ys[0]
+
+    def det(i, j):
+        return (Fraction(hull_xs[j]) - Fraction(hull_xs[i])) * (Fraction(y) - Fraction(hull_ys[i])) - \
+               (Fraction(hull_ys[j]) - Fraction(hull_ys[i])) * (Fraction(x) - Fraction(hull_xs[i]))
+
+    if num_corners == 2:
+        return det(0, 1) == 0 and min(hull_xs) <= x <= max(hull_xs) and min(hull_ys) <= y <= max(hull_ys)
+    # The hull is clockwise, so the inside is to the right of every edge
+    return all(det(i, (i + 1) % num_corners) <= 0 for i in range(num_corners))
+
+
+def point_sets():
+    rng = np.random.default_rng(5)
+    return [rng.random((n, 2)) for n in (1, 2, 3, 4, 10, 200)] + [
+        rng.integers(0, 6, (80, 2)).astype(float),
+        rng.integers(0, 3, (40, 2)).astype(float),
+        np.array([[0, 0], [0, 1], [0, 2.0]]),
+        np.array([[0, 0], [1, 1], [2, 2.0]]),
+        np.array([[1, 1.0]] * 3),
+        np.array([[0, 0], [0, 1], [1, 0], [1, 1], [0.5, 0.5]]),
+    ]
+
+
+# Random probes around the points, the points themselves, half-integer probes
+# (which land on grid hulls' edges and corners), and points along each edge
+def probes_for(points, index, rng):
+    spread = points.max() - points.min() + 1.0
+    probes = [points.min() - 0.2 * spread + rng.random((300, 2)) * 1.4 * spread, points,
+              np.round(rng.random((200, 2)) * 12) / 2]
+    if len(index) >= 2:
+        t = rng.random((50, 1))
+        i = rng.integers(0, len(index), 50)
+        j = (i + 1) % len(index)
+        corners = np.c_[index.hull_xs, index.hull_ys]
+        probes.append(corners[i] * (1 - t) + corners[j] * t)
+    return np.concatenate(probes)
+
+
+@pytest.mark.parametrize('points', point_sets())
+def test_contains(points):
+    index = build_hull_index(points)
+    probes = probes_for(points, index, np.random.default_rng(len(points)))
+    hull_xs, hull_ys = index.hull_xs.tolist(), index.hull_ys.tolist()
+    expected = [brute_contains(hull_xs, hull_ys, x, y) for x, y in probes.tolist()]
+    assert [index.contains(x, y) for x, y in probes.tolist()] == expected
+    assert index.contains_many(probes).tolist() == expected
+
+
+@pytest.mark.parametrize('points', point_sets())
+def test_extreme(points):
+    index = build_hull_index(points)
+    directions = np.concatenate([np.random.default_rng(1).normal(size=(200, 2)),
+                                 [[1, 0], [-1, 0], [0, 1], [0, -1], [1, 1], [-1, -1]]])
+    best = (directions @ points.T).max(axis=1)
+    one = [index.extreme(dx, dy) for dx, dy in directions.tolist()]
+    assert np.allclose((directions * points[one]).sum(axis=1), best)
+    assert np.allclose((directions * points[index.extreme_many(directions)]).sum(axis=1), best)
+
+
+@pytest.mark.parametrize('points', point_sets())
+def test_diameter_width_area(points):
+    index = build_hull_index(points)
+    distance, a, b = index.diameter()
+    assert distance == pytest.approx(np.sqrt(((points[:, None] - points[None]) ** 2).sum(axis=-1)).max(), abs=1e-12)
+    assert math.dist(points[a], points[b]) == pytest.approx(distance, abs=1e-12)
+
+    hull_xs, hull_ys = index.hull_xs, index.hull_ys
+    num_corners = len(index)
+    if num_corners < 3:
+        assert index.width() == 0.0
+        assert index.area == pytest.approx(0.0, abs=1e-12)
+        return
+
+    widths = []
+    for i in range(num_corners):
+        j = (i + 1) % num_corners
+        normal = np.array([hull_ys[i] - hull_ys[j], hull_xs[j] - hull_xs[i]])
+        projections = points @ (normal / np.hypot(*normal))
+        widths.append(projections.max() - projections.min())
+    assert index.width() == pytest.approx(min(widths), abs=1e-12)
+
+    shoelace = sum(hull_xs[i] * hull_ys[(i + 1) % num_corners] - hull_xs[(i + 1) % num_corners] * hull_ys[i]
+                   for i in range(num_corners))
+    assert index.area == pytest.approx(abs(shoelace) / 2, abs=1e-12)
+
+
+def test_empty():
+    index = build_hull_index(np.empty((0, 2)))
+    assert not index.contains(0.0, 0.0)
+    assert index.contains_many(np.zeros((3, 2))).tolist() == [False] * 3
+    with pytest.raises(ValueError):
+        index.extreme(1.0, 0.0)
+    with pytest.raises(ValueError):
+        index.diameter()
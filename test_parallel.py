@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from convex_hull_core import compute_hull_indices
+from convex_hull_parallel import compute_hull_parallel
+from convex_hull_solver import HullSolver
+
+#
+# The parallel divide and conquer against the serial one.  The threshold is
+# turned off so small inputs go through the pool.  Slab boundaries fall at
+# sorted positions, so on grids and repeated x they cut runs of equal x (and
+# of duplicates) in two, and the slab hulls' merge has to cope.
+#
+
+
+def point_sets():
+    rng = np.random.default_rng(11)
+    return {
+        'uniform': rng.random((2000, 2)),
+        'grid': rng.integers(0, 10, (2000, 2)).astype(float),
+        'repeated_x': np.c_[rng.integers(0, 3, 2000), rng.random(2000)],
+        'collinear': np.c_[np.arange(500.0), 2 * np.arange(500.0)][rng.permutation(500)],
+        'tiny': rng.integers(0, 2, (13, 2)).astype(float),
+    }
+
+
+POINT_SETS = point_sets()
+
+
+@pytest.mark.parametrize('slabs', [3, 7])
+def test_parallel_matches_serial(slabs):
+    for name, points in POINT_SETS.items():
+        expected = compute_hull_indices(points).tolist()
+        assert compute_hull_parallel(points, workers=2, slabs=slabs, threshold=0).tolist() == expected, name
+
+
+def test_progress_and_solver():
+    points = POINT_SETS['repeated_x']
+    calls = []
+    solver = HullSolver(workers=2, parallel_threshold=0)
+    hull, _ = solver.solve_points(points, progress=lambda done, total: calls.append((done, total)))
+    assert hull.tolist() == compute_hull_indices(points).tolist()
+    assert calls[-1] == (len(points), len(points))
@@ -0,0 +1,64 @@
+import json
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+import convex_hull_pure
+from convex_hull_core import compute_hull_indices
+
+#
+# The numpy-free path against convex_hull_core.compute_hull_indices, both in
+# this process and in one where numpy can't be imported.
+#
+
+
+def point_lists():
+    rng = np.random.default_rng(3)
+    point_sets = [rng.random((n, 2)) for n in (0, 1, 2, 3, 5, 100, 5000)]
+    point_sets.append(rng.integers(0, 6, (500, 2)).astype(float))
+    point_sets.append(np.array([(i, 2 * i) for i in range(50)] + [(3, 6)] * 4, dtype=float))
+    t = rng.random(30)
+    point_sets.append(np.c_[t, 3 * t + 0.1])
+    return [[tuple(point) for point in points.tolist()] for points in point_sets]
+
+
+POINT_LISTS = point_lists()
+
+
+@pytest.mark.parametrize('engine', convex_hull_pure.PURE_ENGINES)
+def test_pure_matches_core(engine):
+    for points in POINT_LISTS:
+        expected = compute_hull_indices(np.array(points, dtype=float).reshape(-1, 2)).tolist()
+        hull = convex_hull_pure.compute_hull_indices(points, engine=engine)
+        assert hull.typecode == 'l'
+        assert hull.tolist() == expected
+
+
+def test_separate_buffers():
+    points = POINT_LISTS[5]
+    xs, ys = [x for x, _ in points], [y for _, y in points]
+    assert convex_hull_pure.compute_hull_indices(xs, ys).tolist() == \
+        convex_hull_pure.compute_hull_indices(points).tolist()
+
+
+def test_unknown_engine():
+    with pytest.raises(ValueError):
+        convex_hull_pure.compute_hull_indices([(0.0, 0.0)], engine='quickhull')
+
+
+# Runs the same solves with numpy blocked from importing
+def test_without_numpy():
+    script = ("import json, sys\n"
+              "sys.modules['numpy'] = None\n"
+              "import convex_hull_pure\n"
+              "point_lists = json.load(sys.stdin)\n"
+              "print(json.dumps([[convex_hull_pure.compute_hull_indices(points, engine=engine).tolist()\n"
+              "                   for engine in convex_hull_pure.PURE_ENGINES] for points in point_lists]))\n")
+    result = subprocess.run([sys.executable, '-c', script], input=json.dumps(POINT_LISTS), capture_output=True,
+                            text=True, check=True, cwd=os.path.dirname(os.path.abspath(convex_hull_pure.__file__)))
+    for points, hulls in zip(POINT_LISTS, json.loads(result.stdout)):
+        expected = compute_hull_indices(np.array(points, dtype=float).reshape(-1, 2)).tolist()
+        assert hulls == [expected] * len(convex_hull_pure.PURE_ENGINES)
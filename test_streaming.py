@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+
+from convex_hull_core import compute_hull_indices, presort
+from convex_hull_streaming import StreamingHull
+
+#
+# StreamingHull against one solve of every point at once: however the points
+# are split into batches, hull_indices() has to be the hull of the whole stream,
+# with each corner's position in it.  Batches in increasing or decreasing
+# (x, y) order join with a single merge; batches that overlap the hull so far
+# re-solve the union of corners, which is also where duplicates across batches
+# have to resolve to their first occurrence.
+#
+
+
+def point_sets():
+    rng = np.random.default_rng(8)
+    return {
+        'uniform': rng.random((600, 2)),
+        'grid': rng.integers(0, 8, (600, 2)).astype(float),
+        'repeated_x': np.c_[rng.integers(0, 5, 600), rng.random(600)],
+        'collinear': np.c_[np.arange(600.0), 3 * np.arange(600.0)][rng.permutation(600)],
+    }
+
+
+POINT_SETS = point_sets()
+
+
+def stream(points, sizes):
+    bounds = np.cumsum([0] + sizes)
+    streaming = StreamingHull()
+    for lo, hi in zip(bounds[:-1], bounds[1:]):
+        streaming.add_batch(points[lo:hi])
+    return streaming
+
+
+def check(streaming, points):
+    expected = compute_hull_indices(points)
+    assert streaming.hull_indices().tolist() == expected.tolist()
+    assert streaming.hull().tolist() == points[expected].tolist()
+    assert streaming.count == len(points)
+
+
+@pytest.mark.parametrize('name', sorted(POINT_SETS))
+@pytest.mark.parametrize('sizes', [[1] * 40, [7, 50, 3, 200], [300, 300]])
+def test_unordered_batches(name, sizes):
+    points = POINT_SETS[name]
+    sizes = sizes + [len(points) - sum(sizes)]
+    assert min(sizes) >= 0
+    check(stream(points, sizes), points)
+
+
+# Sorted streams only ever see batches entirely to one side of the hull so far
+@pytest.mark.parametrize('name', sorted(POINT_SETS))
+@pytest.mark.parametrize('descending', [False, True])
+def test_sorted_batches(monkeypatch, name, descending):
+    merges = []
+    merge = StreamingHull._merge
+
+    def counted_merge(self, *args):
+        merges.append(args)
+        return merge(self, *args)
+
+    monkeypatch.setattr(StreamingHull, '_merge', counted_merge)
+
+    points = POINT_SETS[name]
+    order = presort(points[:, 0], points[:, 1])  # drops duplicates, so each batch is strictly past the last
+    points = points[order[::-1] if descending else order]
+    sizes = [1, 2, 30, 5]
+    check(stream(points, sizes + [len(points) - sum(sizes)]), points)
+    assert len(merges) == len(sizes)
+
+
+def test_empty_batches():
+    points = POINT_SETS['uniform']
+    streaming = StreamingHull().add_batches([points[:0], points[:100], np.empty((0, 2)), points[100:]])
+    check(streaming, points)
+    assert StreamingHull().hull().shape == (0, 2)